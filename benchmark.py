@@ -0,0 +1,202 @@
+"""Benchmarks for the list manager's data path, on generated data.
+
+    python benchmark.py                                  # 100, 1000 and 10000 levels
+    python benchmark.py --levels 100 1000 --records 50 --output before.json
+    python benchmark.py --levels 10000 --startup         # also open the window
+
+Every size gets a synthetic data/ folder (N levels with M records each) in a
+temporary directory, so the real data is never touched. The result is JSON:
+per size and operation, the time of every run in seconds plus the min and
+median, so two versions can be compared by diffing their output files.
+
+With --startup the manager's window is also opened on the data (this needs
+a display). The time until it takes input must stay under STARTUP_LIMIT;
+the exit code is 1 when it does not.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import manage_list as ml
+
+SIZES = (100, 1000, 10000)
+SEARCH_QUERIES = ("l", "le", "lev", "leve", "level 1", "p1", "zzz")
+STARTUP_LIMIT = 1.0  # seconds until the window takes input, at 10000 levels
+
+def generate_data(data_dir, levels, records, seed=0):
+    """Write `levels` levels with `records` records each, plus the list files."""
+    rng = random.Random(seed)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    players = [f"Player{i}" if i % 5 else f"Игрок{i}" for i in range(max(50, levels * records // 20))]
+    order = []
+    for i in range(levels):
+        fname = f"level{i}"
+        level = dict(ml.DEFAULT_LEVEL)
+        level.update({
+            "id": 100000 + i,
+            "name": f"Level {i}",
+            "author": rng.choice(players),
+            "creators": rng.sample(players, rng.randint(0, 3)),
+            "verifier": rng.choice(players),
+            "verification": f"https://youtu.be/{rng.getrandbits(40):011x}",
+            "percentToQualify": rng.choice((50, 60, 100)),
+            "records": [{
+                "user": user,
+                "link": f"https://youtu.be/{rng.getrandbits(40):011x}",
+                "percent": rng.randint(60, 100),
+                "hz": rng.choice((60, 144, 240, 360)),
+                "mobile": rng.random() < 0.1,
+            } for user in rng.sample(players, min(records, len(players)))],
+            "points": -1.0,
+        })
+        (data_dir / f"{fname}.json").write_bytes(ml.dump_json(level))
+        order.append(fname)
+    (data_dir / ml.LIST_FILE.name).write_bytes(ml.dump_json(order))
+    (data_dir / ml.SETTINGS_FILE.name).write_bytes(ml.dump_json(ml.DEFAULT_SETTINGS))
+    (data_dir / ml.EDITORS_FILE.name).write_bytes(ml.dump_json([{"role": "owner", "name": "Owner"}]))
+    (data_dir / ml.REQS_FILE.name).write_bytes(ml.dump_json(["Show the whole run"]))
+
+def timed(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+def bench_size(levels, records, repeat):
+    with tempfile.TemporaryDirectory(prefix="list-bench-") as tmp:
+        data_dir = Path(tmp) / "data"
+        started = time.perf_counter()
+        generate_data(data_dir, levels, records)
+        timings = {"generate": time.perf_counter() - started}
+
+        def load(store):
+            # What the window's load_data job does
+            store.load()
+            for fname in store.level_files:
+                store.levels.get(fname)
+            ml.LevelSearchIndex().build(store.level_files, store.level)
+            ml.PlayerIndex().build(store.level_files, store.level)
+            return store
+
+        timings["load_cold"] = timed(lambda: load(ml.ListStore(data_dir)), repeat)
+        store = load(ml.ListStore(data_dir))
+        timings["load_warm"] = timed(lambda: load(store.detached()), repeat)
+
+        timings["refresh"] = timed(lambda: [ml.level_display(i, fname, store.level(fname))
+                                            for i, fname in enumerate(store.level_files)], repeat)
+
+        index = ml.LevelSearchIndex()
+        index.build(store.level_files, store.level)
+
+        def search():
+            # Typing a query one key at a time, then starting over
+            for query in SEARCH_QUERIES:
+                index.search(query, store.level_files)
+            index.invalidate()
+        timings["search"] = timed(search, repeat)
+
+        timings["save_unchanged"] = timed(store.save, repeat)
+        counter = iter(range(10 ** 9))
+
+        def save_one_level():
+            store.add_record(store.level_files[0], f"Bench{next(counter)}", 100)
+            store.flush()
+            store.save()
+        timings["save_one_level"] = timed(save_one_level, repeat)
+
+        timings["leaderboard"] = timed(lambda: ml.compute_leaderboard(store.level_files, store.levels), repeat)
+        timings["bundle"] = timed(lambda: ml.build_bundle(data_dir, store.levels), repeat)
+        timings["build"] = timed(store.build, repeat)
+
+        started = time.perf_counter()
+        store.backup("bench")
+        timings["backup_first"] = time.perf_counter() - started
+        timings["backup"] = timed(lambda: store.backup("bench"), repeat)
+        timings["validate_cold"] = timed(lambda: ml.validate_data(data_dir), 1)
+        timings["validate"] = timed(lambda: ml.validate_data(data_dir, store._hash_cache), repeat)
+    return {"levels": levels, "records": records, "timings": timings}
+
+def bench_startup(levels, records):
+    """Open the window on generated data with the Levels tab showing.
+
+    Returns the seconds until the window took input ("startup") and until
+    every level was loaded ("load_levels"), or {"error": ...} without Tk.
+    """
+    if ml.tk is None:
+        return {"error": "tkinter is not installed"}
+    with tempfile.TemporaryDirectory(prefix="list-bench-", ignore_cleanup_errors=True) as tmp:
+        data_dir = Path(tmp) / "data"
+        generate_data(data_dir, levels, records)
+        try:
+            app = ml.ListManager(data_dir)
+        except ml.tk.TclError as e:  # no display
+            return {"error": str(e)}
+        try:
+            app.notebook.select(1)  # as if the Levels tab was clicked right away
+            deadline = time.perf_counter() + 600
+            while "load_levels" not in app.perf.stats and time.perf_counter() < deadline:
+                app.update()
+                time.sleep(0.001)
+            return {name: app.perf.stats[name][2] for name in ("startup", "load_levels") if name in app.perf.stats}
+        finally:
+            app.tasks.cancel_all()
+            app.destroy()
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the manager's data operations on generated data.")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(SIZES), help="list sizes (default: 100 1000 10000)")
+    parser.add_argument("--records", type=int, default=20, help="records per level (default: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation (default: 3)")
+    parser.add_argument("--output", help="write the JSON here instead of printing it")
+    parser.add_argument("--startup", action="store_true", help=f"also time opening the window (limit: {STARTUP_LIMIT}s)")
+    args = parser.parse_args(argv)
+
+    results = []
+    too_slow = []
+    for levels in args.levels:
+        print(f"Benchmarking {levels} levels x {args.records} records...", file=sys.stderr)
+        result = bench_size(levels, args.records, args.repeat)
+        if args.startup:
+            result["startup"] = startup = bench_startup(levels, args.records)
+            if "error" in startup:
+                print(f"Startup not timed: {startup['error']}", file=sys.stderr)
+            elif startup.get("startup", float("inf")) > STARTUP_LIMIT:
+                too_slow.append(levels)
+        results.append(result)
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if too_slow:
+        print(f"Startup over {STARTUP_LIMIT}s at {', '.join(map(str, too_slow))} levels", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,13 +5,149 @@ import { round, score } from './score.js';
  */
 const dir = './data';
 
+let manifestPromise;
+let bundlePromise;
+let listIndexPromise;
+let rouletteIndexPromise;
+const levelPromises = new Map();
+
+/**
+ * Load `_manifest.json`, which maps each data file to a hash of its content.
+ * It is the only file that is always re-downloaded.
+ */
+function fetchManifest() {
+    manifestPromise ??= fetch(`${dir}/_manifest.json?t=${Date.now()}`)
+        .then((result) => (result.ok ? result.json() : {}))
+        .catch(() => ({}));
+    return manifestPromise;
+}
+
+/**
+ * URL of a data file. Files listed in the manifest are requested by content
+ * hash, so unchanged files are served from the browser/CDN cache.
+ */
+async function dataUrl(file) {
+    const manifest = await fetchManifest();
+    const hash = manifest[file];
+    return `${dir}/${file}?${hash ? `v=${hash}` : `t=${Date.now()}`}`;
+}
+
+/**
+ * Load `_bundle.json` (written by `manage_list.py build`) once per page load.
+ * Resolves to null when there is no usable bundle, so callers can fall back
+ * to the individual data files.
+ */
+function fetchBundle() {
+    bundlePromise ??= dataUrl('_bundle.json')
+        .then((url) => fetch(url))
+        .then((result) => (result.ok ? result.json() : null))
+        .catch(() => null);
+    return bundlePromise;
+}
+
+/**
+ * The bundle if a page already asked for it, otherwise null, so small files
+ * are fetched on their own instead of pulling in the whole bundle.
+ */
+async function loadedBundle() {
+    return bundlePromise ? await bundlePromise : null;
+}
+
+/**
+ * Load `_list.index.json` ({ total, pageSize, pages }), written with the
+ * list pages by `manage_list.py build`. Resolves to null when the data has
+ * no list pages, so callers can fall back to `fetchList`.
+ */
+export function fetchListIndex() {
+    listIndexPromise ??= dataUrl('_list.index.json')
+        .then((url) => fetch(url))
+        .then((result) => (result.ok ? result.json() : null))
+        .catch(() => null);
+    return listIndexPromise;
+}
+
+/**
+ * Load `_roulette.json` ({ levels: [[rank, name, id, video]], errors }),
+ * the top of the list without records, written by `manage_list.py build`.
+ * Resolves to null when it is missing.
+ */
+export function fetchRouletteIndex() {
+    rouletteIndexPromise ??= dataUrl('_roulette.json')
+        .then((url) => fetch(url))
+        .then((result) => (result.ok ? result.json() : null))
+        .catch(() => null);
+    return rouletteIndexPromise;
+}
+
+/**
+ * Load page `n` of the list: level summaries ({ path, name, points }) in
+ * the same `[level, err]` form as `fetchList`. Resolves to null on failure.
+ */
+export async function fetchListPage(n) {
+    try {
+        const result = await fetch(await dataUrl(`_list.page-${n}.json`));
+        const page = await result.json();
+        return page.map((entry) => (entry.error ? [null, entry.path] : [entry, null]));
+    } catch {
+        console.error(`Failed to load list page ${n}.`);
+        return null;
+    }
+}
+
+/**
+ * Load one level with its records sorted best first, once per page load.
+ * Resolves to null when the level fails to load.
+ */
+export function fetchLevel(path) {
+    if (!levelPromises.has(path)) {
+        levelPromises.set(
+            path,
+            dataUrl(`${path}.json`)
+                .then((url) => fetch(url))
+                .then((result) => result.json())
+                .then((level) => ({
+                    ...level,
+                    path,
+                    records: [...level.records].sort((a, b) => b.percent - a.percent),
+                }))
+                .catch(() => {
+                    console.error(`Failed to load level ${path}.`);
+                    return null;
+                }),
+        );
+    }
+    return levelPromises.get(path);
+}
+
 export async function fetchList() {
-    const listResult = await fetch(`${dir}/_list.json?t=${Date.now()}`);
+    const bundle = await fetchBundle();
+    if (bundle) {
+        return bundle.list.map((path, rank) => {
+            try {
+                const level = bundle.levels[rank];
+                return [
+                    {
+                        ...level,
+                        path,
+                        records: [...level.records].sort(
+                            (a, b) => b.percent - a.percent,
+                        ),
+                    },
+                    null,
+                ];
+            } catch {
+                console.error(`Failed to load level #${rank + 1} ${path}.`);
+                return [null, path];
+            }
+        });
+    }
+
+    const listResult = await fetch(await dataUrl('_list.json'));
     try {
         const list = await listResult.json();
         return await Promise.all(
             list.map(async (path, rank) => {
-                const levelResult = await fetch(`${dir}/${path}.json?t=${Date.now()}`);
+                const levelResult = await fetch(await dataUrl(`${path}.json`));
                 try {
                     const level = await levelResult.json();
                     return [
@@ -37,8 +173,13 @@ export async function fetchList() {
 }
 
 export async function fetchEditors() {
+    const bundle = await loadedBundle();
+    if (bundle) {
+        return bundle.editors;
+    }
+
     try {
-        const editorsResults = await fetch(`${dir}/_editors.json?t=${Date.now()}`);
+        const editorsResults = await fetch(await dataUrl('_editors.json'));
         const editors = await editorsResults.json();
         return editors;
     } catch {
@@ -47,8 +188,13 @@ export async function fetchEditors() {
 }
 
 export async function fetchRequirements() {
+    const bundle = await loadedBundle();
+    if (bundle?.requirements) {
+        return bundle.requirements;
+    }
+
     try {
-        const result = await fetch(`${dir}/_requirements.json?t=${Date.now()}`);
+        const result = await fetch(await dataUrl('_requirements.json'));
         const reqs = await result.json();
         return reqs;
     } catch {
@@ -57,8 +203,13 @@ export async function fetchRequirements() {
 }
 
 export async function fetchSettings() {
+    const bundle = await loadedBundle();
+    if (bundle) {
+        return bundle.settings;
+    }
+
     try {
-        const result = await fetch(`${dir}/_settings.json?t=${Date.now()}`);
+        const result = await fetch(await dataUrl('_settings.json'));
         return await result.json();
     } catch {
         return null; // Fallback to defaults if missing
@@ -66,9 +217,27 @@ export async function fetchSettings() {
 }
 
 export async function fetchLeaderboard() {
+    // Prefer the leaderboard precomputed by `manage_list.py build`
+    try {
+        const result = await fetch(await dataUrl('_leaderboard.json'));
+        if (result.ok) {
+            const { leaderboard, errors } = await result.json();
+            return [leaderboard, errors];
+        }
+    } catch {
+        // Fall through and compute it from the list
+    }
+
     const list = await fetchList();
 
     const scoreMap = {};
+    // Lowercased name -> key in scoreMap (first spelling seen wins)
+    const userKeys = new Map();
+    const keyFor = (name) => {
+        const folded = name.toLowerCase();
+        if (!userKeys.has(folded)) userKeys.set(folded, name);
+        return userKeys.get(folded);
+    };
     const errs = [];
     list.forEach(([level, err], rank) => {
         if (err) {
@@ -77,9 +246,7 @@ export async function fetchLeaderboard() {
         }
 
         // Verification
-        const verifier = Object.keys(scoreMap).find(
-            (u) => u.toLowerCase() === level.verifier.toLowerCase(),
-        ) || level.verifier;
+        const verifier = keyFor(level.verifier);
         scoreMap[verifier] ??= {
             verified: [],
             completed: [],
@@ -95,9 +262,7 @@ export async function fetchLeaderboard() {
 
         // Records
         level.records.forEach((record) => {
-            const user = Object.keys(scoreMap).find(
-                (u) => u.toLowerCase() === record.user.toLowerCase(),
-            ) || record.user;
+            const user = keyFor(record.user);
             scoreMap[user] ??= {
                 verified: [],
                 completed: [],
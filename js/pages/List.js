@@ -1,7 +1,14 @@
 import { store } from "../store.js";
 import { embed } from "../util.js";
 import { score } from "../score.js";
-import { fetchEditors, fetchList, fetchRequirements } from "../content.js";
+import {
+    fetchEditors,
+    fetchLevel,
+    fetchList,
+    fetchListIndex,
+    fetchListPage,
+    fetchRequirements,
+} from "../content.js";
 
 import Spinner from "../components/Spinner.js";
 import LevelAuthors from "../components/List/LevelAuthors.js";
@@ -29,12 +36,13 @@ export default {
                             <p v-else class="type-label-lg">Legacy</p>
                         </td>
                         <td class="level" :class="{ 'active': selected == i, 'error': !level }">
-                            <button @click="selected = i">
+                            <button @click="select(i)">
                                 <span class="type-label-lg">{{ level?.name || \`Error (\${err}.json)\` }}</span>
                             </button>
                         </td>
                     </tr>
                 </table>
+                <p ref="more" v-if="pagesLoaded < pages" class="type-label-md">Loading more levels...</p>
             </div>
             <div class="level-container">
                 <div class="level" v-if="level">
@@ -76,6 +84,9 @@ export default {
                         </tr>
                     </table>
                 </div>
+                <div v-else-if="levelLoading" class="level" style="height: 100%; justify-content: center; align-items: center;">
+                    <Spinner></Spinner>
+                </div>
                 <div v-else class="level" style="height: 100%; justify-content: center; align-items: center;">
                     <p>(ノಠ益ಠ)ノ彡┻━┻</p>
                 </div>
@@ -112,13 +123,19 @@ export default {
         requirements: [],
         loading: true,
         selected: 0,
+        detail: null,
+        levelLoading: false,
+        pages: 0,
+        pagesLoaded: 0,
+        pageLoading: false,
+        observer: null,
         errors: [],
         roleIconMap,
         store
     }),
     computed: {
         level() {
-            return this.list[this.selected][0];
+            return this.detail;
         },
         video() {
             if (!this.level.showcase) {
@@ -133,24 +150,28 @@ export default {
         },
     },
     async mounted() {
-        // Hide loading spinner
-        this.list = await fetchList();
-        this.editors = await fetchEditors();
-        this.requirements = await fetchRequirements();
+        // Editors and requirements load alongside the list
+        const extras = Promise.all([fetchEditors(), fetchRequirements()]);
+
+        const index = await fetchListIndex();
+        if (index) {
+            // Only the first page is waited for; the rest load on scroll
+            this.pages = index.pages;
+            this.list = index.pages ? await fetchListPage(0) : [];
+            this.pagesLoaded = this.list ? Math.min(1, index.pages) : 0;
+        } else {
+            this.list = await fetchList();
+        }
+        [this.editors, this.requirements] = await extras;
 
         // Error handling
         if (!this.list) {
+            this.pages = 0;
             this.errors = [
                 "Failed to load list. Retry in a few minutes or notify list staff.",
             ];
         } else {
-            this.errors.push(
-                ...this.list
-                    .filter(([_, err]) => err)
-                    .map(([_, err]) => {
-                        return `Failed to load level. (${err}.json)`;
-                    })
-            );
+            this.errors.push(...this.listErrors(this.list));
             if (!this.editors) {
                 this.errors.push("Failed to load list editors.");
             }
@@ -159,10 +180,85 @@ export default {
             }
         }
 
+        // Hide loading spinner
         this.loading = false;
+        if (this.list?.length) {
+            this.select(0);
+        }
+        await this.$nextTick();
+        this.watchScroll();
+    },
+    beforeUnmount() {
+        this.observer?.disconnect();
     },
     methods: {
         embed,
         score,
+        listErrors(entries) {
+            return entries
+                .filter(([_, err]) => err)
+                .map(([_, err]) => `Failed to load level. (${err}.json)`);
+        },
+        async select(i) {
+            this.selected = i;
+            const [level] = this.list[i];
+            if (!level || level.records) {
+                // Nothing to load: a failed level, or fetchList loaded it all
+                this.detail = level;
+                this.levelLoading = false;
+                return;
+            }
+            this.levelLoading = true;
+            const full = await fetchLevel(level.path);
+            if (this.selected !== i) {
+                return;
+            }
+            this.detail = full;
+            this.levelLoading = false;
+            if (!full) {
+                this.errors.push(`Failed to load level. (${level.path}.json)`);
+            }
+        },
+        watchScroll() {
+            const more = this.$refs.more;
+            if (!more) {
+                return;
+            }
+            this.observer = new IntersectionObserver(
+                (entries) => {
+                    if (entries.some((entry) => entry.isIntersecting)) {
+                        this.loadNextPage();
+                    }
+                },
+                { root: more.closest(".list-container"), rootMargin: "800px" },
+            );
+            this.observer.observe(more);
+        },
+        async loadNextPage() {
+            if (this.pageLoading || this.pagesLoaded >= this.pages) {
+                return;
+            }
+            this.pageLoading = true;
+            const page = await fetchListPage(this.pagesLoaded);
+            this.pageLoading = false;
+            if (!page) {
+                this.errors.push(`Failed to load levels from #${this.list.length + 1} on.`);
+                this.pages = this.pagesLoaded;
+                return;
+            }
+            this.list.push(...page);
+            this.errors.push(...this.listErrors(page));
+            this.pagesLoaded += 1;
+
+            await this.$nextTick();
+            const more = this.$refs.more;
+            if (more) {
+                // Observe again so a marker still in view loads the next page
+                this.observer.unobserve(more);
+                this.observer.observe(more);
+            } else {
+                this.observer.disconnect();
+            }
+        },
     },
 };
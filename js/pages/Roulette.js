@@ -1,5 +1,11 @@
-import { fetchList } from '../content.js';
-import { getThumbnailFromId, getYoutubeIdFromUrl, shuffle } from '../util.js';
+import { fetchList, fetchRouletteIndex } from '../content.js';
+import {
+    getThumbnailFromId,
+    getYoutubeIdFromUrl,
+    randomSeed,
+    seededRandom,
+    shuffle,
+} from '../util.js';
 
 import Spinner from '../components/Spinner.js';
 import Btn from '../components/Btn.js';
@@ -34,7 +40,9 @@ export default {
                     <div class="btns">
                         <Btn @click.native.prevent="onImport">Import</Btn>
                         <Btn :disabled="!isActive" @click.native.prevent="onExport">Export</Btn>
+                        <Btn :disabled="seed === undefined" @click.native.prevent="onShare">Share</Btn>
                     </div>
+                    <p v-if="seed !== undefined" class="type-label-md" style="color: #aaa">Seed {{ seed }}</p>
                 </form>
             </div>
             <section class="levels-container">
@@ -102,6 +110,9 @@ export default {
     data: () => ({
         loading: false,
         levels: [],
+        seed: undefined, // levels are rebuilt from this, undefined for old saves
+        main: true, // the lists the running roulette was started with
+        extended: true,
         progression: [], // list of percentages completed
         percentage: undefined,
         givenUp: false,
@@ -119,15 +130,28 @@ export default {
         this.fileInput.accept = '.json';
         this.fileInput.addEventListener('change', this.onImportUpload);
 
-        // Load progress from local storage
-        const roulette = JSON.parse(localStorage.getItem('roulette'));
-
-        if (!roulette) {
-            return;
+        // A shared link (#/roulette?seed=...) starts that roulette
+        const { seed, main, extended } = this.$route.query;
+        const saved = JSON.parse(localStorage.getItem('roulette'));
+        if (seed !== undefined && /^\d+$/.test(seed) && Number(seed) !== saved?.seed) {
+            if (
+                !saved?.progression?.length ||
+                window.confirm('Start the shared roulette? This replaces the one you are playing.')
+            ) {
+                this.load({
+                    seed: Number(seed),
+                    main: main !== '0',
+                    extended: extended !== '0',
+                    progression: [],
+                });
+                return;
+            }
         }
 
-        this.levels = roulette.levels;
-        this.progression = roulette.progression;
+        // Load progress from local storage
+        if (saved) {
+            this.load(saved);
+        }
     },
     computed: {
         currentLevel() {
@@ -167,47 +191,124 @@ export default {
                 return;
             }
 
-            this.loading = true;
+            await this.load({
+                seed: randomSeed(),
+                main: this.useMainList,
+                extended: this.useExtendedList,
+                progression: [],
+            });
+        },
+        /**
+         * Top of the list as [rank, name, id, video, path] from the
+         * roulette index, falling back to the full list when the index is
+         * missing. `broken` is set when a level failed to load, and
+         * `entries` is null when neither could be fetched.
+         */
+        async fetchEntries() {
+            const index = await fetchRouletteIndex();
+            if (index) {
+                return { entries: index.levels, broken: index.errors.length > 0 };
+            }
+
+            let fullList = null;
+            try {
+                fullList = await fetchList();
+            } catch {
+                // offline: same as a missing list
+            }
+            if (!fullList) {
+                return { entries: null, broken: true };
+            }
+            const entries = [];
+            fullList.slice(0, 150).forEach(([lvl, _], i) => {
+                if (lvl) entries.push([i + 1, lvl.name, lvl.id, lvl.verification, lvl.path]);
+            });
+            return { entries, broken: entries.length < Math.min(fullList.length, 150) };
+        },
+        /**
+         * Rebuild a roulette from its saved state. A new or shared roulette
+         * picks its levels with the seed; a saved one keeps the level files
+         * it was played with, so changes to the list never swap them. Levels
+         * that cannot be found (or all of them, while the list cannot be
+         * fetched) are shown as placeholders so the run is never lost. Old
+         * saves still carry their levels or level IDs.
+         */
+        async load({ seed, main, extended, paths, ids, levels, progression }) {
+            this.showRemaining = false;
+            this.givenUp = false;
+            this.percentage = undefined;
 
-            const fullList = await fetchList();
+            if (seed === undefined) {
+                this.seed = undefined;
+                this.levels = levels;
+                this.progression = progression;
+                return;
+            }
 
-            if (fullList.filter(([_, err]) => err).length > 0) {
-                this.loading = false;
+            this.loading = true;
+            const { entries, broken } = await this.fetchEntries();
+            this.loading = false;
+            const saved = paths ?? ids;
+            if (!saved && broken) {
                 this.showToast(
                     'List is currently broken. Wait until it\'s fixed to start a roulette.',
                 );
                 return;
             }
 
-            const fullListMapped = fullList.map(([lvl, _], i) => ({
-                rank: i + 1,
-                id: lvl.id,
-                name: lvl.name,
-                video: lvl.verification,
+            const all = (entries ?? []).map(([rank, name, id, video, path]) => ({
+                rank,
+                id,
+                path,
+                name,
+                // The index holds the YouTube ID unless the video is elsewhere
+                video: video.includes('/') ? video : `https://youtu.be/${video}`,
             }));
-            const list = [];
-            if (this.useMainList) list.push(...fullListMapped.slice(0, 75));
-            if (this.useExtendedList) {
-                list.push(...fullListMapped.slice(75, 150));
-            }
 
-            // random 100 levels
-            this.levels = shuffle(list).slice(0, 100);
-            this.showRemaining = false;
-            this.givenUp = false;
-            this.progression = [];
-            this.percentage = undefined;
-
-            this.loading = false;
+            if (saved) {
+                const key = paths ? 'path' : 'id';
+                const found = new Map(all.map((level) => [level[key], level]));
+                this.levels = saved.map((value) => found.get(value) ?? {
+                    rank: '?',
+                    id: paths ? undefined : value,
+                    path: paths ? value : undefined,
+                    name: `${paths ? value : `Level ${value}`} (${entries ? 'no longer in the top 150' : 'list unavailable'})`,
+                    video: '',
+                });
+                const gone = saved.filter((value) => !found.has(value)).length;
+                if (!entries) {
+                    this.showToast('The list could not be loaded; this roulette\'s levels will show again once it is back.');
+                } else if (gone > 0) {
+                    this.showToast(`${gone} level(s) of this roulette have left the top 150 or failed to load since it was started.`);
+                }
+            } else {
+                const list = all.filter(({ rank }) => (main && rank <= 75) || (extended && rank > 75));
+                // random 100 levels, the same ones for the same seed
+                this.levels = shuffle(list, seededRandom(seed)).slice(0, 100);
+            }
+            this.seed = seed;
+            this.main = this.useMainList = main;
+            this.extended = this.useExtendedList = extended;
+            this.progression = progression;
+            this.save();
+        },
+        state() {
+            if (this.seed === undefined) {
+                return { levels: this.levels, progression: this.progression };
+            }
+            // Level files are unique, IDs are not; only old saves whose
+            // levels could not be found yet are still kept by ID
+            const byPath = this.levels.every((level) => level.path !== undefined);
+            return {
+                seed: this.seed,
+                main: this.main,
+                extended: this.extended,
+                [byPath ? 'paths' : 'ids']: this.levels.map((level) => (byPath ? level.path : level.id)),
+                progression: this.progression,
+            };
         },
         save() {
-            localStorage.setItem(
-                'roulette',
-                JSON.stringify({
-                    levels: this.levels,
-                    progression: this.progression,
-                }),
-            );
+            localStorage.setItem('roulette', JSON.stringify(this.state()));
         },
         onDone() {
             if (!this.percentage) {
@@ -256,17 +357,18 @@ export default {
             try {
                 const roulette = JSON.parse(await file.text());
 
-                if (!roulette.levels || !roulette.progression) {
+                if (
+                    !Array.isArray(roulette.progression) ||
+                    (!Number.isInteger(roulette.seed) && !roulette.levels) ||
+                    (roulette.ids !== undefined && !Array.isArray(roulette.ids)) ||
+                    (roulette.paths !== undefined && !Array.isArray(roulette.paths))
+                ) {
                     this.showToast('Invalid file.');
                     return;
                 }
 
-                this.levels = roulette.levels;
-                this.progression = roulette.progression;
-                this.save();
-                this.givenUp = false;
-                this.showRemaining = false;
-                this.percentage = undefined;
+                await this.load(roulette);
+                if (roulette.seed === undefined) this.save();
             } catch {
                 this.showToast('Invalid file.');
                 return;
@@ -274,10 +376,7 @@ export default {
         },
         onExport() {
             const file = new Blob(
-                [JSON.stringify({
-                    levels: this.levels,
-                    progression: this.progression,
-                })],
+                [JSON.stringify(this.state())],
                 { type: 'application/json' },
             );
             const a = document.createElement('a');
@@ -286,6 +385,23 @@ export default {
             a.click();
             URL.revokeObjectURL(a.href);
         },
+        async onShare() {
+            const { href } = this.$router.resolve({
+                path: '/roulette',
+                query: {
+                    seed: this.seed,
+                    main: this.main ? 1 : 0,
+                    extended: this.extended ? 1 : 0,
+                },
+            });
+            const link = new URL(href, window.location.href).href;
+            try {
+                await navigator.clipboard.writeText(link);
+                this.showToast('Link copied. It gives the same levels while the list stays the same.');
+            } catch {
+                window.prompt('Copy this link:', link);
+            }
+        },
         showToast(msg) {
             this.toasts.push(msg);
             setTimeout(() => {
@@ -17,14 +17,33 @@ export function getThumbnailFromId(id) {
     return `https://img.youtube.com/vi/${id}/mqdefault.jpg`;
 }
 
+/**
+ * Seeded random numbers in [0, 1) (mulberry32), so the same seed always
+ * gives the same sequence.
+ */
+export function seededRandom(seed) {
+    let a = seed >>> 0;
+    return () => {
+        a = (a + 0x6d2b79f5) >>> 0;
+        let t = a;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+export function randomSeed() {
+    return crypto.getRandomValues(new Uint32Array(1))[0];
+}
+
 // https://stackoverflow.com/questions/2450954/how-to-randomize-shuffle-a-javascript-array
-export function shuffle(array) {
+export function shuffle(array, random = Math.random) {
     let currentIndex = array.length, randomIndex;
 
     // While there remain elements to shuffle.
     while (currentIndex != 0) {
         // Pick a remaining element.
-        randomIndex = Math.floor(Math.random() * currentIndex);
+        randomIndex = Math.floor(random() * currentIndex);
         currentIndex--;
 
         // And swap it with the current element.
@@ -1,12 +1,36 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, colorchooser, filedialog
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, simpledialog, colorchooser, filedialog
+except ImportError:  # Headless server without Tk: only the command line works
+    tk = None
+import argparse
+import shlex
 import json
+import csv
 import os
+import sys
+import copy
+import gzip
+import hashlib
+import math
+import multiprocessing
+import re
+from decimal import Decimal
 import shutil
+import tempfile
 from pathlib import Path
+from collections import Counter
 import datetime
+import time
+import contextlib
+import cProfile
+import pstats
 import subprocess
+import urllib.parse
+import sqlite3
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 DATA_DIR = Path("data")
 BACKUP_DIR = Path("backups")
@@ -14,9 +38,2546 @@ LIST_FILE = DATA_DIR / "_list.json"
 EDITORS_FILE = DATA_DIR / "_editors.json"
 REQS_FILE = DATA_DIR / "_requirements.json"
 SETTINGS_FILE = DATA_DIR / "_settings.json"
+BUNDLE_FILE = DATA_DIR / "_bundle.json"
+MANIFEST_FILE = DATA_DIR / "_manifest.json"
+LEADERBOARD_FILE = DATA_DIR / "_leaderboard.json"
+LIST_INDEX_FILE = DATA_DIR / "_list.index.json"  # pages are _list.page-<n>.json
+LIST_PAGE_SIZE = 50
+ROULETTE_FILE = DATA_DIR / "_roulette.json"
+ROULETTE_RANKS = 150  # main + extended list, what the roulette picks from
+DB_FILE = Path("list.sqlite3")  # only used with --db
+DEPLOY_STATE_FILE = ".deploy_state.json"  # in the repo root, not committed
+VALIDATE_CACHE_FILE = ".validate_cache.json"  # same
+JOURNAL_FILE = ".journal.jsonl"  # same
+JOURNAL_UNDO_LIMIT = 100  # edits that can be undone
+JOURNAL_COMPACT_LINES = 500  # the journal is rewritten to just its undo history past this
+BUILD_DELAY_MS = 2000  # the window writes journaled edits to data/ once editing pauses this long
+VALIDATE_PARALLEL_MIN = 64  # fewer changed files are checked without a process pool
+SCORE_SCALE = 3  # decimal digits, same as `scale` in js/score.js
+SEARCH_DEBOUNCE_MS = 150
+TASK_POLL_MS = 50
+LOAD_CHUNK = 500  # levels indexed and drawn per step while the window loads them
+WATCH_MIN_MS = 1000  # data/ polling; the interval grows while nothing changes
+WATCH_MAX_MS = 8000
+BACKUP_KEEP_LAST = 48   # snapshots always kept by prune
+BACKUP_KEEP_DAILY = 30  # plus the newest snapshot of each of this many days
+
+DEFAULT_SETTINGS = {
+    "title": "CCL - GDPS List",
+    "primary_color": "#003366",
+    "telegram_link": "https://t.me/chaigdpscl",
+    "submit_link": "#",
+    "list_name_header": "CCL"
+}
+
+DEFAULT_LEVEL = {
+    "id": 0,
+    "name": "",
+    "author": "Author",
+    "creators": [],
+    "verifier": "Verifier",
+    "verification": "https://youtu.be/example",
+    "percentToQualify": 100,
+    "password": "Free to Copy",
+    "records": []
+}
+
+def atomic_write(path, payload):
+    """Replace `path` with `payload` (bytes) so a crash never leaves it half written."""
+    path = Path(path)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644  # mkstemp files are private; data files must stay readable
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def write_if_changed(path, payload):
+    """Atomically write `payload` unless the file already holds exactly those bytes.
+
+    Returns True if the file was written.
+    """
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass
+    atomic_write(path, payload)
+    return True
+
+def dump_json(data):
+    # Same layout the manager has always written: indent=4, ASCII escapes
+    return json.dumps(data, indent=4).encode("utf-8")
+
+def dump_min_json(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+class LevelCache:
+    """Parsed level files keyed by filename.
+
+    A file is only re-read when its mtime or size differs from the copy we
+    hold, so refreshing the list does not parse unchanged levels again.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self._entries = {}  # fname -> (mtime_ns, size, data)
+        self._written = {}  # fname -> (mtime_ns, size) after our last save
+
+    def path(self, fname):
+        return self.data_dir / f"{fname}.json"
+
+    def get(self, fname):
+        """Return the parsed level, or None if it is missing or invalid."""
+        path = self.path(fname)
+        try:
+            st = path.stat()
+        except OSError:
+            self._entries.pop(fname, None)
+            return None
+
+        entry = self._entries.get(fname)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict):  # a level is a JSON object
+            self._entries.pop(fname, None)
+            return None
+        self._entries[fname] = (st.st_mtime_ns, st.st_size, data)
+        return data
+
+    def save(self, fname, data):
+        path = self.path(fname)
+        write_if_changed(path, dump_json(data))
+        st = path.stat()
+        self._entries[fname] = (st.st_mtime_ns, st.st_size, data)
+        self._written[fname] = (st.st_mtime_ns, st.st_size)
+
+    def wrote(self, fname):
+        """True if the file on disk is the one `save` last wrote."""
+        return fname in self._written and self._written[fname] == file_stamp(self.path(fname))
+
+    def delete(self, fname):
+        self._entries.pop(fname, None)
+        self._written.pop(fname, None)
+        try:
+            os.remove(self.path(fname))
+        except OSError:
+            pass
+
+    def clear(self):
+        self._entries.clear()
+
+
+class LevelSearchIndex:
+    """Lowercased search text for every level, kept next to the level cache.
+
+    Covers filename, name, author, verifier, creators and ID. When a query
+    extends the previous one, only the previous hits are scanned again.
+    """
 
-class ListManager(tk.Tk):
     def __init__(self):
+        self._text = {}  # fname -> searchable text
+        self._last_query = None
+        self._last_hits = None
+
+    @staticmethod
+    def _searchable(fname, data):
+        parts = [fname]
+        if data:
+            for key in ("name", "author", "verifier", "id"):
+                parts.append(str(data.get(key, "")))
+            parts.extend(str(c) for c in data.get("creators") or [])
+        # Newlines keep a query from matching across two fields
+        return "\n".join(parts).lower()
+
+    def build(self, level_files, lookup):
+        """Index `level_files`; `lookup(fname)` returns a level dict or None."""
+        self._text = {fname: self._searchable(fname, lookup(fname)) for fname in level_files}
+        self.invalidate()
+
+    def update(self, fname, data):
+        self._text[fname] = self._searchable(fname, data)
+        self.invalidate()
+
+    def remove(self, fname):
+        self._text.pop(fname, None)
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget the previous result set (call after the order changes)."""
+        self._last_query = None
+        self._last_hits = None
+
+    def search(self, query, level_files):
+        """Return the indices into `level_files` that match `query`."""
+        query = query.strip().lower()
+        if not query:
+            hits = list(range(len(level_files)))
+        else:
+            if self._last_hits is not None and self._last_query and self._last_query in query:
+                candidates = self._last_hits
+            else:
+                candidates = range(len(level_files))
+            text = self._text
+            hits = [i for i in candidates if query in text.get(level_files[i], level_files[i].lower())]
+        self._last_query = query
+        self._last_hits = hits
+        return hits
+
+def _name_key(name):
+    # Same folding as the site's leaderboard; SQLite's NOCASE would only fold ASCII
+    return str(name).lower()
+
+class PlayerIndex:
+    """Where every player appears: lowercased name -> level -> [(record index, role, name)].
+
+    Role is "record" (with the index into the level's records) or "verifier"
+    (index None). Kept up to date per level on every save, so listing or
+    renaming a player never scans all the levels.
+    """
+
+    def __init__(self):
+        self._entries = {}  # key -> {fname: [(index, role, name)]}
+        self._levels = {}   # fname -> keys found on that level
+
+    def build(self, level_files, lookup):
+        """Index `level_files`; `lookup(fname)` returns a level dict or None."""
+        self._entries.clear()
+        self._levels.clear()
+        for fname in level_files:
+            self.update(fname, lookup(fname))
+
+    def update(self, fname, data):
+        self.remove(fname)
+        found = {}
+        if data:
+            if data.get("verifier"):
+                found.setdefault(_name_key(data["verifier"]), []).append((None, "verifier", str(data["verifier"])))
+            records = data.get("records")
+            for i, record in enumerate(records if isinstance(records, list) else []):
+                if isinstance(record, dict) and str(record.get("user", "")).strip():
+                    found.setdefault(_name_key(record["user"]), []).append((i, "record", str(record["user"])))
+        for key, entries in found.items():
+            self._entries.setdefault(key, {})[fname] = entries
+        self._levels[fname] = set(found)
+
+    def remove(self, fname):
+        for key in self._levels.pop(fname, ()):
+            levels = self._entries[key]
+            levels.pop(fname, None)
+            if not levels:
+                del self._entries[key]
+
+    def levels_of(self, name):
+        return list(self._entries.get(_name_key(name), {}))
+
+    def entries(self, name, level_files):
+        """[(rank, fname, record index, role)] for `name`, in list order."""
+        ranks = {fname: i for i, fname in enumerate(level_files, 1)}
+        rows = [(ranks.get(fname), fname, index, role)
+                for fname, entries in self._entries.get(_name_key(name), {}).items()
+                for index, role, _ in entries]
+        return sorted(rows, key=lambda r: (r[0] is None, r[0] or 0, r[3] != "verifier", r[2] or 0))
+
+    def players(self):
+        """[(name, appearances)] sorted by name; the name is the most used spelling."""
+        result = []
+        for levels in self._entries.values():
+            spellings = Counter(name for entries in levels.values() for _, _, name in entries)
+            result.append((spellings.most_common(1)[0][0], sum(spellings.values())))
+        return sorted(result, key=lambda p: p[0].lower())
+
+def file_stamp(path):
+    """(mtime_ns, size) of `path`, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def read_json(path, default=None):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def write_gzip_copy(path, payload):
+    # mtime=0 keeps the archive byte-identical when the content is unchanged
+    write_if_changed(f"{path}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+
+def build_bundle(data_dir=DATA_DIR, cache=None):
+    """Write `_bundle.json` (+ `.gz`) so the site can load everything at once.
+
+    The bundle holds the ordered level filenames, every level (null where the
+    file is missing or invalid), settings, editors and requirements.
+    Returns the bundle path and the filenames that failed to load.
+    """
+    data_dir = Path(data_dir)
+    cache = cache or LevelCache(data_dir)
+    order = read_json(data_dir / "_list.json", [])
+
+    levels = []
+    errors = []
+    for fname in order:
+        level = cache.get(fname)
+        if level is None:
+            errors.append(fname)
+        levels.append(level)
+
+    bundle = {
+        "list": order,
+        "levels": levels,
+        "settings": read_json(data_dir / "_settings.json"),
+        "editors": read_json(data_dir / "_editors.json"),
+        "requirements": read_json(data_dir / "_requirements.json"),
+    }
+    payload = dump_min_json(bundle)
+
+    path = data_dir / BUNDLE_FILE.name
+    if write_if_changed(path, payload) or not os.path.exists(f"{path}.gz"):
+        write_gzip_copy(path, payload)
+    return path, errors
+
+def list_page_name(n):
+    return f"_list.page-{n}.json"
+
+def build_list_pages(data_dir=DATA_DIR, cache=None):
+    """Write the list as pages of slim summaries, plus `_list.index.json`.
+
+    Page n holds ranks n*LIST_PAGE_SIZE+1 onwards as {"path", "name",
+    "points"} ({"path", "error": true} for a level that failed to load),
+    so the list page can show the top of the list before the rest is
+    fetched. Pages past the end of a shorter list are removed.
+    """
+    data_dir = Path(data_dir)
+    cache = cache or LevelCache(data_dir)
+    order = read_json(data_dir / LIST_FILE.name, [])
+
+    summaries = []
+    for fname in order:
+        level = cache.get(fname)
+        if not isinstance(level, dict):
+            summaries.append({"path": fname, "error": True})
+            continue
+        summary = {"path": fname, "name": level.get("name", fname)}
+        if "points" in level:
+            summary["points"] = level["points"]
+        summaries.append(summary)
+
+    pages = math.ceil(len(summaries) / LIST_PAGE_SIZE)
+    for n in range(pages):
+        write_if_changed(data_dir / list_page_name(n),
+                         dump_min_json(summaries[n * LIST_PAGE_SIZE:(n + 1) * LIST_PAGE_SIZE]))
+    for path in data_dir.glob(list_page_name("*")):
+        n = path.name[len("_list.page-"):-len(".json")]
+        if not n.isdigit() or int(n) >= pages:
+            path.unlink()
+    write_if_changed(data_dir / LIST_INDEX_FILE.name,
+                     dump_min_json({"total": len(summaries), "pageSize": LIST_PAGE_SIZE, "pages": pages}))
+
+# Same pattern as getYoutubeIdFromUrl() in js/util.js
+YOUTUBE_ID_RE = re.compile(r".*(?:youtu.be/|v/|u/\w/|embed/|watch\?v=)([^#&?]*).*")
+
+def youtube_id(url):
+    match = YOUTUBE_ID_RE.match(url or "")
+    return match.group(1) if match else ""
+
+def build_roulette_index(data_dir=DATA_DIR, cache=None):
+    """Write `_roulette.json`, the top ROULETTE_RANKS levels without records.
+
+    Levels are [rank, name, id, video, path] with the YouTube ID of the
+    verification as video (the full link when it is not on YouTube) and
+    the level's file name as path, which unlike the ID is unique. Levels
+    that failed to load are listed under "errors" instead.
+    """
+    data_dir = Path(data_dir)
+    cache = cache or LevelCache(data_dir)
+    order = read_json(data_dir / LIST_FILE.name, [])
+
+    levels = []
+    errors = []
+    for rank, fname in enumerate(order[:ROULETTE_RANKS], 1):
+        level = cache.get(fname)
+        if not isinstance(level, dict):
+            errors.append(fname)
+            continue
+        video = level.get("verification") or ""
+        video_id = youtube_id(video) if "youtu" in video else ""
+        levels.append([rank, level.get("name", fname), level.get("id"), video_id or video, fname])
+    path = data_dir / ROULETTE_FILE.name
+    write_if_changed(path, dump_min_json({"levels": levels, "errors": errors}))
+    return path
+
+# --- Scoring (port of js/score.js, keep the two in sync) ---
+def round_score(num):
+    """Round to SCORE_SCALE decimals exactly like `round()` in js/score.js.
+
+    The JS version shifts the decimal point in the number's string form and
+    uses Math.round (halves go up), so do the same with Decimal.
+    """
+    shifted = float(Decimal(repr(float(num))).scaleb(SCORE_SCALE))
+    rounded = math.floor(shifted)
+    if shifted - rounded >= 0.5:
+        rounded += 1
+    return float(Decimal(rounded).scaleb(-SCORE_SCALE))
+
+def score(rank, percent, min_percent, manual_points=None):
+    """Points for a record, same rules as `score()` in js/score.js."""
+    # Non-100% records get 0 points
+    if percent < 100:
+        return 0
+
+    # Manual points override (-1 = auto, 0 is a valid legacy value)
+    if manual_points is not None and manual_points > -1:
+        return manual_points
+
+    if rank > 150:
+        return 0
+
+    value = -24.9975 * math.pow(rank - 1, 0.4) + 200
+    value = max(0, value)
+    return max(round_score(value), 0)
+
+def compute_leaderboard(order, cache):
+    """Build the sorted leaderboard in one pass over every record.
+
+    Returns (entries, errors) in the shape fetchLeaderboard() used to build in
+    the browser. Players are matched case-insensitively through a dict keyed
+    by the lowercased name; the first spelling seen is the one displayed.
+    """
+    players = {}  # lowercased name -> entry
+    errors = []
+
+    def entry_for(user):
+        key = user.lower()
+        entry = players.get(key)
+        if entry is None:
+            entry = players[key] = {"user": user, "verified": [], "completed": [], "progressed": []}
+        return entry
+
+    for i, fname in enumerate(order):
+        level = cache.get(fname)
+        if level is None:
+            errors.append(fname)
+            continue
+        rank = i + 1
+        points = level.get("points")
+        pct_to_qualify = level.get("percentToQualify")
+
+        entry_for(str(level.get("verifier", "")))["verified"].append({
+            "rank": rank,
+            "level": level.get("name"),
+            "score": score(rank, 100, pct_to_qualify, points),
+            "link": level.get("verification"),
+        })
+
+        records = sorted(level.get("records") or [], key=lambda r: -r.get("percent", 0))
+        for record in records:
+            entry = entry_for(str(record.get("user", "")))
+            if record.get("percent") == 100:
+                entry["completed"].append({
+                    "rank": rank,
+                    "level": level.get("name"),
+                    "score": score(rank, 100, pct_to_qualify, points),
+                    "link": record.get("link"),
+                })
+                continue
+            entry["progressed"].append({
+                "rank": rank,
+                "level": level.get("name"),
+                "percent": record.get("percent"),
+                "score": score(rank, record.get("percent", 0), pct_to_qualify, points),
+                "link": record.get("link"),
+            })
+
+    leaderboard = []
+    for entry in players.values():
+        total = 0
+        for kind in ("verified", "completed", "progressed"):
+            for item in entry[kind]:
+                total += item["score"]
+        total = round_score(total)
+        if total > 0:
+            leaderboard.append({"user": entry.pop("user"), "total": total, **entry})
+    leaderboard.sort(key=lambda e: -e["total"])
+    return leaderboard, errors
+
+def build_leaderboard(data_dir=DATA_DIR, cache=None):
+    """Write `_leaderboard.json` so the Leaderboard page only has to render it."""
+    data_dir = Path(data_dir)
+    cache = cache or LevelCache(data_dir)
+    order = read_json(data_dir / "_list.json", [])
+    leaderboard, errors = compute_leaderboard(order, cache)
+    path = data_dir / LEADERBOARD_FILE.name
+    write_if_changed(path, dump_min_json({"leaderboard": leaderboard, "errors": errors}))
+    return path
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def content_hash(path):
+    return file_sha256(path)[:12]
+
+def _cached_hash(path, hash_cache):
+    st = path.stat()
+    entry = hash_cache.get(path.name)
+    if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    digest = content_hash(path)
+    hash_cache[path.name] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+def build_manifest(data_dir=DATA_DIR, hash_cache=None):
+    """Write `_manifest.json` mapping every data file to a short content hash.
+
+    The site requests `<file>?v=<hash>` so browsers keep unchanged files cached
+    between deploys. `hash_cache` (path -> (mtime_ns, size, hash)) lets repeated
+    builds skip hashing files that have not changed.
+    """
+    data_dir = Path(data_dir)
+    hash_cache = {} if hash_cache is None else hash_cache
+    manifest = {}
+    for path in sorted(data_dir.glob("*.json")):
+        if path.name == MANIFEST_FILE.name:
+            continue
+        manifest[path.name] = _cached_hash(path, hash_cache)
+
+    write_if_changed(data_dir / MANIFEST_FILE.name, dump_json(manifest))
+    return manifest
+
+# --- Validation ---
+VALIDATOR_VERSION = 1  # bump when check_level changes, so cached results are redone
+LEVEL_FIELDS = {
+    "id": (int,),
+    "name": (str,),
+    "author": (str,),
+    "creators": (list,),
+    "verifier": (str,),
+    "verification": (str,),
+    "percentToQualify": (int,),
+    "password": (str, int),
+    "records": (list,),
+}
+OPTIONAL_LEVEL_FIELDS = {"points": (int, float), "showcase": (str,)}
+RECORD_FIELDS = {"user": (str,), "link": (str,), "percent": (int,), "hz": (int,), "mobile": (bool,)}
+MAX_HZ = 1000
+
+def _type_ok(value, types):
+    # bool is an int to isinstance, but true/false is never a valid number here
+    if isinstance(value, bool):
+        return bool in types
+    return isinstance(value, types)
+
+def _is_url(value):
+    parts = urllib.parse.urlsplit(value)
+    return parts.scheme in ("http", "https") and bool(parts.netloc) and not any(c.isspace() for c in value)
+
+def check_level(data):
+    """Return the problems in one level that would break or mislead the site."""
+    if not isinstance(data, dict):
+        return ["not a JSON object"]
+    problems = []
+    for fields, required in ((LEVEL_FIELDS, True), (OPTIONAL_LEVEL_FIELDS, False)):
+        for key, types in fields.items():
+            if key not in data:
+                if required:
+                    problems.append(f"missing '{key}'")
+            elif not _type_ok(data[key], types):
+                problems.append(f"'{key}' should be {' or '.join(t.__name__ for t in types)}")
+    if not str(data.get("name", "")).strip():
+        problems.append("name is empty")
+    qualify = data.get("percentToQualify")
+    if _type_ok(qualify, (int,)) and not 0 < qualify <= 100:
+        problems.append(f"percentToQualify {qualify} is not 1-100")
+    if isinstance(data.get("creators"), list) and not all(isinstance(c, str) for c in data["creators"]):
+        problems.append("creators should all be strings")
+    for key in ("verification", "showcase"):
+        value = data.get(key)
+        if isinstance(value, str) and value and not _is_url(value):
+            problems.append(f"{key} is not a http(s) link: {value!r}")
+
+    records = data.get("records")
+    for i, record in enumerate(records if isinstance(records, list) else [], 1):
+        where = f"record {i}"
+        if not isinstance(record, dict):
+            problems.append(f"{where}: not a JSON object")
+            continue
+        where = f"record {i} ({record.get('user', '?')})"
+        for key, types in RECORD_FIELDS.items():
+            if key not in record:
+                problems.append(f"{where}: missing '{key}'")
+            elif not _type_ok(record[key], types):
+                problems.append(f"{where}: '{key}' should be {types[0].__name__}")
+        if isinstance(record.get("user"), str) and not record["user"].strip():
+            problems.append(f"{where}: user is empty")
+        percent = record.get("percent")
+        if _type_ok(percent, (int,)):
+            if not 0 < percent <= 100:
+                problems.append(f"{where}: percent {percent} is not 1-100")
+            elif _type_ok(qualify, (int,)) and percent < qualify:
+                problems.append(f"{where}: {percent}% is below percentToQualify ({qualify}%)")
+        hz = record.get("hz")
+        if _type_ok(hz, (int,)) and not 0 < hz <= MAX_HZ:
+            problems.append(f"{where}: hz {hz} is not 1-{MAX_HZ}")
+        link = record.get("link")
+        if isinstance(link, str) and link and not _is_url(link):
+            problems.append(f"{where}: link is not a http(s) link: {link!r}")
+    return problems
+
+def _check_level_file(path):
+    # Runs in a worker process: returns (problems, level id)
+    try:
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except OSError as e:
+        return [f"cannot read file: {e}"], None
+    except ValueError as e:
+        return [f"invalid JSON: {e}"], None
+    level_id = data.get("id") if isinstance(data, dict) else None
+    return check_level(data), level_id if _type_ok(level_id, (int,)) else None
+
+def validate_data(data_dir=DATA_DIR, hash_cache=None, workers=None, progress=None):
+    """Check every level file and the list itself; returns a list of problems.
+
+    Level files are checked in a process pool. Results are kept in
+    `.validate_cache.json` (next to data/) by content hash, so a second run
+    only re-checks files that changed. The cross-file checks (list entries
+    without a file, files not on the list, duplicate filenames and IDs) use
+    the cached per-file results and are always redone.
+    """
+    data_dir = Path(data_dir)
+    hash_cache = {} if hash_cache is None else hash_cache
+    cache_path = data_dir.parent / VALIDATE_CACHE_FILE
+    cache = read_json(cache_path, {})
+    results = cache.get("results", {}) if cache.get("version") == VALIDATOR_VERSION else {}
+
+    files = {path.stem: path for path in sorted(data_dir.glob("*.json")) if not path.name.startswith("_")}
+    hashes = {fname: _cached_hash(path, hash_cache) for fname, path in files.items()}
+    todo = sorted({digest: fname for fname, digest in hashes.items() if digest not in results}.items())
+    if todo and progress:
+        progress(f"Checking {len(todo)} changed level file(s)")
+    paths = [str(files[fname]) for _, fname in todo]
+    if len(paths) >= VALIDATE_PARALLEL_MIN:
+        # spawn: the window calls this from a worker thread, where forking is unsafe
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            checked = list(pool.map(_check_level_file, paths, chunksize=32))
+    else:
+        checked = [_check_level_file(path) for path in paths]
+    for (digest, _), (level_problems, level_id) in zip(todo, checked):
+        results[digest] = [level_problems, level_id]
+
+    used = {hashes[fname]: results[hashes[fname]] for fname in files}
+    write_if_changed(cache_path, dump_min_json({"version": VALIDATOR_VERSION, "results": used}))
+
+    problems = []
+    order = read_json(data_dir / LIST_FILE.name)
+    if not isinstance(order, list) or not all(isinstance(f, str) for f in order):
+        return [f"{LIST_FILE.name}: not a JSON list of filenames"]
+    seen_ids = {}
+    seen_names = {}
+    for i, fname in enumerate(order, 1):
+        where = f"#{i} {fname}"
+        if fname.lower() in seen_names:
+            problems.append(f"{where}: listed more than once (also #{seen_names[fname.lower()]})")
+            continue
+        seen_names[fname.lower()] = i
+        if fname not in files:
+            problems.append(f"{where}: no {fname}.json file")
+            continue
+        level_problems, level_id = results[hashes[fname]]
+        problems.extend(f"{where}: {p}" for p in level_problems)
+        if not level_id:
+            pass  # 0 is the placeholder ID of new levels
+        elif level_id in seen_ids:
+            problems.append(f"{where}: ID {level_id} already used by {seen_ids[level_id]}")
+        else:
+            seen_ids[level_id] = fname
+    lowered = {}
+    for fname in files:
+        if fname.lower() in lowered:
+            problems.append(f"{fname}.json: same name as {lowered[fname.lower()]}.json except for case")
+        lowered.setdefault(fname.lower(), fname)
+        if fname.lower() not in seen_names:
+            problems.append(f"{fname}.json: not on the list")
+    return problems
+
+# fdatasync skips the metadata flush; Windows and macOS only have fsync
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+_MISSING = object()  # a field a level does not have, when comparing journal sides
+
+def order_hash(order):
+    return hashlib.sha256(dump_json(order)).hexdigest()[:16]
+
+class Journal:
+    """Append-only log of list edits, one JSON line per edit, synced as it is written.
+
+    An entry holds what an edit changed, so it can be undone or applied
+    again: the top-level fields of an edited level that changed
+    (`"fields": {fname: [before, after]}`, a field missing from the side
+    that did not have it), the end of its record list from the first
+    changed record (`"records": {fname: [start, before, after]}`), the whole
+    document of an added or deleted level (`"levels"`, None on the side
+    without it) and the moves made in the order (`[fname, old, new]`
+    indices, None when not on the list). `checkpoint` records that the
+    edits so far reached data/; entries after the last checkpoint are
+    replayed on the next start. Before the list order is written,
+    `list_written` notes which entries it includes, since order moves are
+    positions and must not be replayed onto an order that already has
+    them. `forget` drops the undo history after changes the journal did
+    not see. `compact` rewrites the file to one line holding the undo
+    history.
+    """
+
+    def __init__(self, path, limit=JOURNAL_UNDO_LIMIT):
+        self.path = Path(path)
+        self.limit = limit
+        self.seq = 0
+        self.saved_seq = 0  # last checkpoint
+        self.order_mark = None  # (seq, hash) of a list write after the last checkpoint
+        self.undo_stack = []
+        self.redo_stack = []
+        self.lines = 0
+        self._file = None
+        self._lock = threading.Lock()  # compaction runs in the background
+
+    @staticmethod
+    def inverse(entry):
+        return {**entry, "levels": {fname: [after, before] for fname, (before, after) in entry["levels"].items()},
+                "fields": {fname: [after, before] for fname, (before, after) in entry.get("fields", {}).items()},
+                "records": {fname: [start, after, before] for fname, (start, before, after) in entry.get("records", {}).items()},
+                "order": [[fname, new, old] for fname, old, new in entry["order"]]}
+
+    def _track(self, entry):
+        kind = entry["kind"]
+        if kind == "do":
+            self.undo_stack.append(entry)
+            del self.undo_stack[:-self.limit]
+            self.redo_stack.clear()
+        elif kind == "undo" and self.undo_stack:
+            self.redo_stack.append(self.undo_stack.pop())
+        elif kind == "redo" and self.redo_stack:
+            self.undo_stack.append(self.redo_stack.pop())
+
+    def _append(self, entry):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(dump_min_json(entry) + b"\n")
+        self._file.flush()
+        _datasync(self._file.fileno())
+        self.lines += 1
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def load(self):
+        """Read the journal; returns the entries that never reached data/, oldest first."""
+        with self._lock:
+            self._close()
+            self.seq = self.saved_seq = self.lines = 0
+            self.order_mark = None
+            self.undo_stack, self.redo_stack = [], []
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                return []
+            end = raw.rfind(b"\n") + 1
+            if end < len(raw):
+                # A crash cut the last line short; drop it so the next entry starts on its own line
+                with open(self.path, "r+b") as f:
+                    f.truncate(end)
+            entries = []
+            for line in raw[:end].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.lines += 1
+                if "checkpoint" in entry:
+                    self.saved_seq = entry["checkpoint"]
+                    self.seq = max(self.seq, self.saved_seq)
+                    self.order_mark = None
+                    if "undo" in entry:
+                        self.undo_stack, self.redo_stack = entry["undo"], entry["redo"]
+                    continue
+                if "list_written" in entry:
+                    self.order_mark = (entry["list_written"], entry["hash"])
+                    continue
+                if "forget" in entry:
+                    self.undo_stack, self.redo_stack = [], []
+                    continue
+                self.seq = entry["seq"]
+                self._track(entry)
+                entries.append(entry)
+            return [entry for entry in entries if entry["seq"] > self.saved_seq]
+
+    def record(self, entry):
+        """Log a new edit; it becomes the one Undo reverts."""
+        with self._lock:
+            self.seq += 1
+            entry.update(seq=self.seq, kind="do")
+            self._append(entry)
+            self._track(entry)
+
+    def undo(self, check=None):
+        """Log the reversal of the last edit and return it (to apply), or None.
+
+        `check(entry)` runs first and may raise to leave the history as it is.
+        """
+        with self._lock:
+            if not self.undo_stack:
+                return None
+            entry = self.inverse(self.undo_stack[-1])
+            if check is not None:
+                check(entry)
+            self.seq += 1
+            entry.update(seq=self.seq, kind="undo")
+            self._append(entry)
+            self._track(entry)
+            return entry
+
+    def redo(self, check=None):
+        """Log the last undone edit again and return it (to apply), or None; see `undo`."""
+        with self._lock:
+            if not self.redo_stack:
+                return None
+            entry = dict(self.redo_stack[-1])
+            if check is not None:
+                check(entry)
+            self.seq += 1
+            entry.update(seq=self.seq, kind="redo")
+            self._append(entry)
+            self._track(entry)
+            return entry
+
+    def list_written(self, seq, order):
+        """Note that `order`, which includes the entries up to `seq`, is about to be written."""
+        with self._lock:
+            self._append({"list_written": self.seq if seq is None else seq, "hash": order_hash(order)})
+
+    def checkpoint(self, seq=None):
+        """Record that every entry up to `seq` (default: all) is written to data/."""
+        with self._lock:
+            seq = self.seq if seq is None else seq
+            if seq > self.saved_seq:
+                self._append({"checkpoint": seq})
+                self.saved_seq = seq
+
+    def compact(self):
+        """Rewrite the file to a single line with the undo history; False while edits are unwritten."""
+        with self._lock:
+            if self.saved_seq < self.seq:
+                return False
+            self._close()
+            atomic_write(self.path, dump_min_json({"checkpoint": self.seq, "undo": self.undo_stack,
+                                                   "redo": self.redo_stack}) + b"\n")
+            self.lines = 1
+            return True
+
+    def forget(self):
+        """Forget the undo history, keeping unwritten edits (after a change the journal did not see)."""
+        with self._lock:
+            self.undo_stack, self.redo_stack = [], []
+            self._append({"forget": self.seq})
+
+    def clear(self):
+        """Forget the undo history and any unwritten edits (after a restore)."""
+        with self._lock:
+            self._close()
+            self.undo_stack, self.redo_stack = [], []
+            self.saved_seq = self.seq
+            atomic_write(self.path, dump_min_json({"checkpoint": self.seq, "undo": [], "redo": []}) + b"\n")
+            self.lines = 1
+
+class SnapshotStore:
+    """Content-addressed backups of the data folder.
+
+    Each distinct file content is stored once under `objects/<hash>`, and a
+    snapshot is only a small manifest (file name -> hash) under `snapshots/`,
+    so a snapshot of an unchanged list costs one tiny file. Objects are
+    read-only; exported snapshot folders hardlink to them where the file
+    system allows it.
+    """
+
+    def __init__(self, root=BACKUP_DIR):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.snapshots = self.root / "snapshots"
+        self._index_path = self.root / "index.json"  # name -> [mtime_ns, size, hash]
+
+    def _object(self, digest):
+        return self.objects / digest[:2] / digest
+
+    def _hash_files(self, data_dir):
+        # Hash every data file, reusing the last hash when mtime/size match
+        index = read_json(self._index_path, {})
+        new_index = {}
+        files = {}
+        for path in sorted(Path(data_dir).iterdir()):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            st = path.stat()
+            entry = index.get(path.name)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                digest = entry[2]
+            else:
+                digest = file_sha256(path)
+            files[path.name] = digest
+            new_index[path.name] = [st.st_mtime_ns, st.st_size, digest]
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self._index_path, dump_json(new_index))
+        return files
+
+    def _store_object(self, payload):
+        digest = hashlib.sha256(payload).hexdigest()
+        obj = self._object(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(obj, payload)
+            os.chmod(obj, 0o444)
+        return digest
+
+    def _read_object(self, digest):
+        with open(self._object(digest), "rb") as f:
+            payload = f.read()
+        if hashlib.sha256(payload).hexdigest() != digest:
+            raise ValueError(f"Backup object {digest} is corrupted")
+        return payload
+
+    def take(self, data_dir, label="", progress=None):
+        """Snapshot every file in `data_dir` and return the snapshot ID.
+
+        `progress(done, total)` is called per file and may raise to cancel.
+        """
+        data_dir = Path(data_dir)
+        files = self._hash_files(data_dir)
+        for i, (name, digest) in enumerate(files.items(), 1):
+            if progress:
+                progress(i, len(files))
+            if not self._object(digest).exists():
+                with open(data_dir / name, "rb") as f:
+                    # Store what we actually read, even if it changed after hashing
+                    files[name] = self._store_object(f.read())
+
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        now = datetime.datetime.now()
+        snap_id = base = now.strftime("%Y%m%d_%H%M%S")
+        n = 1
+        while (self.snapshots / f"{snap_id}.json").exists():
+            n += 1
+            snap_id = f"{base}_{n}"
+        manifest = {"created": now.isoformat(timespec="seconds"), "label": label, "files": files}
+        atomic_write(self.snapshots / f"{snap_id}.json", dump_json(manifest))
+        return snap_id
+
+    def list(self):
+        """Return [(snapshot ID, manifest)], newest first."""
+        result = []
+        for path in sorted(self.snapshots.glob("*.json"), reverse=True):
+            manifest = read_json(path)
+            if manifest:
+                result.append((path.stem, manifest))
+        return result
+
+    def load(self, snap_id):
+        manifest = read_json(self.snapshots / f"{snap_id}.json")
+        if not manifest:
+            raise ValueError(f"Snapshot '{snap_id}' not found")
+        return manifest
+
+    def restore(self, snap_id, data_dir, names=None, progress=None):
+        """Make `data_dir` match a snapshot, or only the files in `names`.
+
+        Files that already match are left alone. A full restore also removes
+        files the snapshot does not have. Returns (restored, removed) names.
+        """
+        data_dir = Path(data_dir)
+        files = self.load(snap_id)["files"]
+        if names is not None:
+            missing = [n for n in names if n not in files]
+            if missing:
+                raise ValueError(f"Not in snapshot {snap_id}: {', '.join(missing)}")
+            files = {n: files[n] for n in names}
+
+        current = self._hash_files(data_dir)
+        restored = []
+        for i, (name, digest) in enumerate(files.items(), 1):
+            if progress:
+                progress(i, len(files))
+            if current.get(name) != digest:
+                atomic_write(data_dir / name, self._read_object(digest))
+                restored.append(name)
+        removed = []
+        if names is None:
+            for name in current:
+                if name not in files:
+                    os.remove(data_dir / name)
+                    removed.append(name)
+        return restored, removed
+
+    def export(self, snap_id, dest):
+        """Materialize a snapshot as a plain folder (hardlinks where possible)."""
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        for name, digest in self.load(snap_id)["files"].items():
+            target = dest / name
+            if target.exists():
+                continue
+            try:
+                os.link(self._object(digest), target)
+            except OSError:
+                shutil.copyfile(self._object(digest), target)
+        return dest
+
+    def prune(self, keep_last=BACKUP_KEEP_LAST, keep_daily=BACKUP_KEEP_DAILY):
+        """Delete old snapshots and the objects no snapshot uses any more.
+
+        Keeps the newest `keep_last` snapshots plus the newest snapshot of
+        each of the last `keep_daily` days. Returns (snapshots, objects) removed.
+        """
+        snapshots = self.list()
+        keep = {snap_id for snap_id, _ in snapshots[:keep_last]}
+        days = []
+        for snap_id, manifest in snapshots:
+            day = manifest.get("created", snap_id)[:10]
+            if day not in days:
+                days.append(day)
+                if len(days) > keep_daily:
+                    break
+                keep.add(snap_id)
+
+        removed_snapshots = 0
+        referenced = set()
+        for snap_id, manifest in snapshots:
+            if snap_id in keep:
+                referenced.update(manifest["files"].values())
+            else:
+                os.remove(self.snapshots / f"{snap_id}.json")
+                removed_snapshots += 1
+
+        removed_objects = 0
+        for obj in self.objects.glob("*/*"):
+            if obj.name not in referenced:
+                os.chmod(obj, 0o644)  # objects are read-only (Windows refuses to delete them)
+                os.remove(obj)
+                removed_objects += 1
+        return removed_snapshots, removed_objects
+
+class ListStore:
+    """The list data on disk, with no UI attached.
+
+    `ListManager` and the command line both edit the list through this class.
+    Level edits made with `put_level`/`add_level`/`delete_level`/`add_record`/
+    `set_points` stay in memory until `flush()`, so a batch of operations
+    writes each touched file once.
+    With a `Journal` attached (`open_journal`), every edit is also logged
+    there, `undo`/`redo` work, and `load` replays edits that were never flushed.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, cache=None):
+        self.data_dir = Path(data_dir)
+        self.backup_dir = self.data_dir.parent / BACKUP_DIR.name
+        self.levels = cache or LevelCache(self.data_dir)
+        self.settings_data = dict(DEFAULT_SETTINGS)
+        self.level_files = []
+        self.editors_data = []
+        self.reqs_data = []
+        self._pending = {}  # fname -> level data not written yet
+        self._deleted = set()
+        self._order_dirty = False
+        self._hash_cache = {}
+        self.journal = None
+        self.recovered = 0  # journal entries replayed by the last load
+        self._journal_seq = None  # last entry an `unsaved` copy holds (None: all)
+
+    def _path(self, file):
+        return self.data_dir / file.name
+
+    def load(self):
+        self.data_dir.mkdir(exist_ok=True)
+        self.backup_dir.mkdir(exist_ok=True)
+
+        settings = read_json(self._path(SETTINGS_FILE))
+        self.settings_data = settings if settings is not None else dict(DEFAULT_SETTINGS)
+        self.level_files = read_json(self._path(LIST_FILE), [])
+        self.editors_data = read_json(self._path(EDITORS_FILE), [])
+        self.reqs_data = read_json(self._path(REQS_FILE), [])
+
+        self._pending.clear()
+        self._deleted.clear()
+        self._order_dirty = False
+        self._replay_journal()
+
+    def _write(self, file, data):
+        # Unchanged files are skipped, so saving everything is cheap
+        return write_if_changed(self._path(file), dump_json(data))
+
+    def save_settings(self):
+        return self._write(SETTINGS_FILE, self.settings_data)
+
+    def save_list(self):
+        self._order_dirty = False
+        if self.journal is not None:
+            self.journal.list_written(self._journal_seq, self.level_files)
+        return self._write(LIST_FILE, self.level_files)
+
+    def save_editors(self):
+        return self._write(EDITORS_FILE, self.editors_data)
+
+    def save_requirements(self):
+        return self._write(REQS_FILE, self.reqs_data)
+
+    def save(self):
+        """Write the four list files; returns the names of those that changed."""
+        written = []
+        for file, save in ((SETTINGS_FILE, self.save_settings), (LIST_FILE, self.save_list),
+                           (EDITORS_FILE, self.save_editors), (REQS_FILE, self.save_requirements)):
+            if save():
+                written.append(file.name)
+        return written
+
+    def detached(self):
+        """Copy of the list contents sharing this store's caches.
+
+        Background jobs save or reload through a copy so the window's store
+        is never changed under it.
+        """
+        other = ListStore(self.data_dir, self.levels)
+        other._hash_cache = self._hash_cache
+        other.settings_data = copy.deepcopy(self.settings_data)
+        other.level_files = list(self.level_files)
+        other.editors_data = copy.deepcopy(self.editors_data)
+        other.reqs_data = list(self.reqs_data)
+        return other
+
+    # --- Levels ---
+    def level(self, fname):
+        """Return a level (including unsaved edits), or None if missing/invalid."""
+        if fname in self._pending:
+            return self._pending[fname]
+        if fname in self._deleted:
+            return None
+        return self.levels.get(fname)
+
+    def _editable(self, fname):
+        # Edits go to a private copy so a failed batch never leaks into the cache
+        if fname in self._pending:
+            return self._pending[fname]
+        data = self.level(fname)
+        if data is None:
+            raise ValueError(f"Level '{fname}' not found or has invalid JSON")
+        data = copy.deepcopy(data)
+        self._pending[fname] = data
+        return data
+
+    def put_level(self, fname, data):
+        self._deleted.discard(fname)
+        self._pending[fname] = data
+
+    def edit_level(self, fname, data):
+        """Replace a level with an edited copy (the edit window's save), like `put_level` but journaled."""
+        before = self._before(fname)
+        self.put_level(fname, data)
+        self._log("edit", fname, before)
+
+    def add_level(self, fname, fields=None, rank=None):
+        fname = fname.strip()
+        if not fname:
+            raise ValueError("Level filename is empty")
+        if fname in self.level_files:
+            raise ValueError(f"Level filename '{fname}' already exists")
+        data = copy.deepcopy(DEFAULT_LEVEL)
+        data["name"] = fname
+        data.update(fields or {})
+        before = self._before(fname)
+        self.put_level(fname, data)
+        total = len(self.level_files) + 1
+        rank = total if rank is None else max(1, min(int(rank), total))
+        self.level_files.insert(rank - 1, fname)
+        self._order_dirty = True
+        self._log("add", fname, before, [[fname, None, rank - 1]])
+        return data
+
+    def delete_level(self, fname):
+        if fname not in self.level_files and self.level(fname) is None:
+            raise ValueError(f"Level '{fname}' not found")
+        before = self._before(fname)
+        moves = []
+        if fname in self.level_files:
+            moves.append([fname, self.level_files.index(fname), None])
+            self.level_files.remove(fname)
+            self._order_dirty = True
+        self._pending.pop(fname, None)
+        self._deleted.add(fname)
+        self._log("delete", fname, before, moves)
+
+    def move_level(self, fname, rank):
+        """Move a level to a 1-based rank (clamped to the list)."""
+        return self.move_levels([fname], rank)
+
+    def move_levels(self, fnames, rank):
+        """Move levels as one block, in list order, so the first lands at 1-based `rank`.
+
+        `rank` is clamped to the list. The order is rebuilt in one pass.
+        Returns the (first, last) positions whose level changed, or None.
+        """
+        moving = set(fnames)
+        old = {fname: i for i, fname in enumerate(self.level_files) if fname in moving}
+        missing = [fname for fname in fnames if fname not in old]
+        if missing:
+            raise ValueError(f"Level '{missing[0]}' is not on the list")
+        block = [fname for fname in self.level_files if fname in moving]
+        rest = [fname for fname in self.level_files if fname not in moving]
+        start = max(1, min(int(rank), len(rest) + 1)) - 1
+        moves = [[fname, old[fname], start + i] for i, fname in enumerate(block) if old[fname] != start + i]
+        if not moves:
+            return None
+        self.level_files[:] = rest[:start] + block + rest[start:]
+        self._order_dirty = True
+        self._log("move", block[0] if len(block) == 1 else f"{len(block)} levels", {}, moves)
+        positions = [i for _, old_i, new_i in moves for i in (old_i, new_i)]
+        return min(positions), max(positions)
+
+    def reorder_levels(self, order):
+        """Replace the list order with `order`, which must hold every listed level once.
+
+        Returns the (first, last) positions whose level changed, or None.
+        """
+        current = {fname: i for i, fname in enumerate(self.level_files)}
+        seen = set()
+        problems = []
+        for fname in order:
+            if fname not in current:
+                problems.append(f"'{fname}' is not on the list")
+            elif fname in seen:
+                problems.append(f"'{fname}' is listed twice")
+            seen.add(fname)
+        missing = [fname for fname in self.level_files if fname not in seen]
+        if missing:
+            problems.append(f"{len(missing)} level(s) missing, e.g. '{missing[0]}'")
+        if problems:
+            more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+            raise ValueError("Order not changed: " + "; ".join(problems[:5]) + more)
+        changed = [i for i, fname in enumerate(order) if self.level_files[i] != fname]
+        if not changed:
+            return None
+        # Only the levels that changed place are journaled
+        moves = [[order[i], current[order[i]], i] for i in changed]
+        self.level_files[:] = order
+        self._order_dirty = True
+        self._log("reorder", f"{len(changed)} levels", {}, moves)
+        return changed[0], changed[-1]
+
+    def add_record(self, fname, user, percent, hz=360, link="", mobile=False):
+        try:
+            record = {
+                "user": user,
+                "link": link,
+                "percent": int(percent),
+                "hz": int(hz),
+                "mobile": bool(mobile)
+            }
+        except ValueError:
+            raise ValueError("Percent and Hz must be numbers")
+        records = self._editable(fname).setdefault("records", [])
+        records.append(record)
+        # Only the new record is journaled, not the whole level
+        self._log_records("record", fname, len(records) - 1, [], [record])
+        return record
+
+    def set_points(self, fname, points):
+        try:
+            points = float(points)
+        except ValueError:
+            raise ValueError("Points must be a number (-1 = Auto)")
+        before = self._before(fname)
+        self._editable(fname)["points"] = points
+        self._log("points", fname, before)
+
+    def rename_player(self, old, new, fnames):
+        """Rename player `old` to `new` on the levels `fnames` (see `PlayerIndex.levels_of`).
+
+        Records and the verifier field are renamed. If `new` is a different
+        player who already has a record on a level, the two are merged and
+        only the best record is kept. Returns the number of records dropped.
+        """
+        new = new.strip()
+        if not new:
+            raise ValueError("New player name is empty")
+        old_key, new_key = _name_key(old), _name_key(new)
+        merging = old_key != new_key
+        dropped = 0
+        before = self._before(*fnames)
+        for fname in fnames:
+            data = self._editable(fname)
+            if _name_key(data.get("verifier", "")) == old_key:
+                data["verifier"] = new
+            records = data.get("records")
+            if not isinstance(records, list):
+                continue
+            kept = []
+            best = None  # position in `kept` of the merged player's record
+            for record in records:
+                key = _name_key(record.get("user", "")) if isinstance(record, dict) else None
+                if key == old_key:
+                    record["user"] = new
+                if key not in (old_key, new_key) or not merging:
+                    kept.append(record)
+                elif best is None:
+                    best = len(kept)
+                    kept.append(record)
+                else:
+                    dropped += 1
+                    if record.get("percent", 0) > kept[best].get("percent", 0):
+                        kept[best] = record
+            records[:] = kept
+        self._log("rename", old, before)
+        return dropped
+
+    # --- Journal ---
+    def open_journal(self, path=None):
+        """Log edits to `path` (default: .journal.jsonl next to the data folder)."""
+        self.journal = Journal(path or self.data_dir.parent / JOURNAL_FILE)
+        return self.journal
+
+    def _before(self, *fnames):
+        # Levels as they are before an edit, for its journal entry
+        if self.journal is None:
+            return None
+        return {fname: copy.deepcopy(self.level(fname)) for fname in fnames}
+
+    def _log(self, op, target, before, moves=()):
+        if self.journal is None:
+            return
+        levels, fields, records = {}, {}, {}
+        for fname, doc in before.items():
+            after = copy.deepcopy(self.level(fname))
+            if not isinstance(doc, dict) or not isinstance(after, dict):
+                levels[fname] = [doc, after]  # added or deleted: the whole document
+                continue
+            old, new = doc.get("records"), after.get("records")
+            if isinstance(old, list) and isinstance(new, list):
+                start = 0
+                while start < min(len(old), len(new)) and old[start] == new[start]:
+                    start += 1
+                if start < max(len(old), len(new)):
+                    records[fname] = [start, old[start:], new[start:]]
+                doc, after = dict(doc), dict(after)
+                del doc["records"], after["records"]
+            changed = [key for key in doc.keys() | after.keys() if doc.get(key, _MISSING) != after.get(key, _MISSING)]
+            if changed:
+                fields[fname] = [{key: doc[key] for key in changed if key in doc},
+                                 {key: after[key] for key in changed if key in after}]
+        self.journal.record({"op": op, "target": target, "levels": levels, "fields": fields, "records": records,
+                             "order": [list(m) for m in moves]})
+
+    def _log_records(self, op, fname, start, before, after):
+        # Records from `start` on were `before` and are now `after`
+        if self.journal is None:
+            return
+        self.journal.record({"op": op, "target": fname, "levels": {}, "order": [],
+                             "records": {fname: [start, copy.deepcopy(before), copy.deepcopy(after)]}})
+
+    def apply_change(self, entry, order=True):
+        """Make the levels (and with `order`, the order) match a journal entry's "after" side.
+
+        Only what the entry changed is set, so other changes to the same
+        level are kept. Applying one entry twice gives the same result:
+        fields are set to their values and record changes replace the list
+        from a fixed position, so a level file that was already written ends
+        up the same. Order moves are only replayed onto an order without
+        them (see `Journal.list_written`).
+        """
+        for fname, (_, doc) in entry["levels"].items():
+            if doc is None:
+                self._pending.pop(fname, None)
+                self._deleted.add(fname)
+            else:
+                self.put_level(fname, copy.deepcopy(doc))
+        for fname, (before, after) in entry.get("fields", {}).items():
+            if self.level(fname) is None:
+                continue
+            data = self._editable(fname)
+            for key in before.keys() | after.keys():
+                if key in after:
+                    data[key] = copy.deepcopy(after[key])
+                else:
+                    data.pop(key, None)
+        for fname, (start, _, after) in entry.get("records", {}).items():
+            if self.level(fname) is None:
+                continue  # the level is gone; nothing to apply to
+            self._editable(fname).setdefault("records", [])[start:] = copy.deepcopy(after)
+        moves = entry["order"] if order else None
+        if moves:
+            moved = {fname for fname, _, _ in moves}
+            order = [fname for fname in self.level_files if fname not in moved]
+            # Ascending inserts put every moved level at its final index
+            for new, fname in sorted((new, fname) for fname, _, new in moves if new is not None):
+                order.insert(min(new, len(order)), fname)
+            self.level_files[:] = order
+            self._order_dirty = True
+
+    def _replay_journal(self):
+        self.recovered = 0
+        if self.journal is None:
+            return
+        entries = self.journal.load()
+        mark = self.journal.order_mark
+        in_order = mark[0] if mark and mark[1] == order_hash(self.level_files) else 0
+        for entry in entries:
+            self.apply_change(entry, order=entry["seq"] > in_order)
+            self.recovered += 1
+
+    def conflicts(self, entry):
+        """Levels that no longer match the "before" side of a journal entry.
+
+        They were changed since by something the journal did not see (the
+        command line, another program, an import), and applying the entry
+        would undo that change too.
+        """
+        found = []
+        for fname, (doc, _) in entry["levels"].items():
+            if self.level(fname) != doc:
+                found.append(fname)
+        for fname, (before, after) in entry.get("fields", {}).items():
+            data = self.level(fname)
+            if data is None or any(data.get(key, _MISSING) != before.get(key, _MISSING)
+                                   for key in before.keys() | after.keys()):
+                found.append(fname)
+        for fname, (start, before, _) in entry.get("records", {}).items():
+            data = self.level(fname)
+            records = data.get("records", []) if data is not None else None
+            if not isinstance(records, list) or len(records) != start + len(before) or records[start:] != before:
+                found.append(fname)
+        positions = {fname: i for i, fname in enumerate(self.level_files)}
+        for fname, old, _ in entry["order"]:
+            if positions.get(fname) != old:
+                found.append(fname)
+        return list(dict.fromkeys(found))
+
+    def _check_change(self, entry):
+        found = self.conflicts(entry)
+        if found:
+            more = f" (and {len(found) - 5} more)" if len(found) > 5 else ""
+            raise ValueError("Changed outside the manager since: " + ", ".join(found[:5]) + more)
+
+    def undo(self, force=False):
+        """Revert the last journaled edit; returns the applied entry, or None.
+
+        Raises ValueError if a level it touches was changed outside the
+        journal since (see `conflicts`), unless `force`.
+        """
+        entry = self.journal.undo(None if force else self._check_change)
+        if entry is not None:
+            self.apply_change(entry)
+        return entry
+
+    def redo(self, force=False):
+        entry = self.journal.redo(None if force else self._check_change)
+        if entry is not None:
+            self.apply_change(entry)
+        return entry
+
+    @property
+    def dirty(self):
+        """True while some edits are only in memory (and the journal)."""
+        return bool(self._pending or self._deleted or self._order_dirty)
+
+    def pending(self, fname):
+        """True while a level has edits not yet written to data/."""
+        return fname in self._pending or fname in self._deleted
+
+    def discard(self, fname):
+        """Drop a level's unwritten edits, so it is read from data/ again."""
+        self._pending.pop(fname, None)
+        self._deleted.discard(fname)
+
+    def unsaved(self):
+        """Detached copy holding the unwritten edits, to `flush` in the background.
+
+        Pass it to `saved` afterwards. The copy's flush moves the journal
+        checkpoint only up to the entries it contains.
+        """
+        other = self.detached()
+        other._pending = copy.deepcopy(self._pending)
+        other._deleted = set(self._deleted)
+        other._order_dirty = self._order_dirty
+        other.journal = self.journal
+        other._journal_seq = self.journal.seq if self.journal else None
+        other._written = dict(other._pending)  # flush empties _pending
+        return other
+
+    def saved(self, other):
+        """Forget the edits `other` (from `unsaved`) wrote, except those changed again since."""
+        for fname, data in other._written.items():
+            if self._pending.get(fname) == data:
+                del self._pending[fname]
+        self._deleted -= other._deleted
+        if self._order_dirty and self.level_files == other.level_files:
+            self._order_dirty = False
+
+    def flush(self):
+        """Write every pending level change, and the list order if it moved.
+
+        Returns True if the order was written.
+        """
+        for fname in self._deleted:
+            self.levels.delete(fname)
+        for fname, data in self._pending.items():
+            self.levels.save(fname, data)
+        self._deleted.clear()
+        self._pending.clear()
+        wrote_order = self._order_dirty
+        if wrote_order:
+            self.save_list()
+        if self.journal is not None:
+            self.journal.checkpoint(self._journal_seq)
+        return wrote_order
+
+    # --- Site files, checks and backups ---
+    def build(self):
+        """Rebuild the bundle, list pages, leaderboard, roulette index and manifest. Returns failed levels."""
+        _, errors = build_bundle(self.data_dir, self.levels)
+        build_list_pages(self.data_dir, self.levels)
+        build_leaderboard(self.data_dir, self.levels)
+        build_roulette_index(self.data_dir, self.levels)
+        build_manifest(self.data_dir, self._hash_cache)
+        return errors
+
+    def validate(self, progress=None):
+        """Return a list of problems in data/ that would break the site."""
+        return validate_data(self.data_dir, self._hash_cache, progress=progress)
+
+    @property
+    def snapshots(self):
+        return SnapshotStore(self.backup_dir)
+
+    def backup(self, label="", progress=None):
+        """Take a snapshot of the data folder; returns its ID."""
+        return self.snapshots.take(self.data_dir, label, progress)
+
+    def restore_snapshot(self, snap_id, level=None, progress=None):
+        """Restore a whole snapshot, or a single level file from it.
+
+        A snapshot of the current data is taken first, so a restore can
+        itself be undone. A restored level that is no longer on the list is
+        added to the end. Returns (restored, removed) file names.
+        """
+        snapshots = self.snapshots
+        snapshots.take(self.data_dir, f"before restoring {snap_id}")
+        names = None if level is None else [f"{level}.json"]
+        restored, removed = snapshots.restore(snap_id, self.data_dir, names, progress)
+        self.levels.clear()
+        self.load()
+        if level is not None and level not in self.level_files:
+            self.level_files.append(level)
+            self.save_list()
+        return restored, removed
+
+    def restore(self, backup_path):
+        """Copy an old-style backup folder (backups/backup_<date>) over data/."""
+        for f in Path(backup_path).glob("*"):
+            if f.is_file():
+                with open(f, "rb") as src:
+                    atomic_write(self.data_dir / f.name, src.read())
+        self.levels.clear()
+        self.load()
+
+# --- SQLite storage ---
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS levels (
+    fname TEXT PRIMARY KEY,
+    name TEXT, author TEXT, verifier TEXT, level_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS levels_level_id ON levels (level_id);
+CREATE TABLE IF NOT EXISTS level_people (
+    fname TEXT NOT NULL, role TEXT NOT NULL, name TEXT NOT NULL, name_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS level_people_name ON level_people (name_key);
+CREATE INDEX IF NOT EXISTS level_people_fname ON level_people (fname);
+CREATE TABLE IF NOT EXISTS records (
+    fname TEXT NOT NULL, position INTEGER NOT NULL,
+    user TEXT, user_key TEXT, percent INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (fname, position)
+);
+CREATE INDEX IF NOT EXISTS records_user ON records (user_key);
+CREATE TABLE IF NOT EXISTS ordering (position INTEGER PRIMARY KEY, fname TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS ordering_fname ON ordering (fname);
+"""
+META_KEYS = {SETTINGS_FILE.name: "settings", EDITORS_FILE.name: "editors", REQS_FILE.name: "requirements"}
+
+class SQLiteStore(ListStore):
+    """A `ListStore` kept in a SQLite database, with data/ as its export.
+
+    Levels, records and the list order live in indexed tables, so lookups
+    across levels (every record of a player, every level of a creator) read
+    a few rows instead of parsing every file. Each write also exports the
+    JSON files it touched, so the site, the build and deploy keep reading
+    data/ exactly as before. Level dicts are stored with their key order and
+    exact values, so `import_json` followed by `export_json` is lossless.
+    """
+
+    def __init__(self, db_path=DB_FILE, data_dir=DATA_DIR, cache=None):
+        super().__init__(data_dir, cache)
+        self.db_path = Path(db_path)
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._parsed = {}  # fname -> level read from the database
+        self._data_version = None
+
+    @property
+    def db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.executescript(SQLITE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _check_external_changes(self):
+        # data_version moves when another connection (a CLI run, a background
+        # job) commits, which is when the parsed levels may be stale
+        version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._parsed.clear()
+            self._data_version = version
+
+    def is_empty(self):
+        return self.db.execute("SELECT 1 FROM meta UNION ALL SELECT 1 FROM levels LIMIT 1").fetchone() is None
+
+    def load(self):
+        if self.is_empty():
+            raise ValueError(f"{self.db_path} is empty, run 'db import' first")
+        self.data_dir.mkdir(exist_ok=True)
+        self.backup_dir.mkdir(exist_ok=True)
+
+        meta = {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM meta")}
+        self.settings_data = meta.get("settings", dict(DEFAULT_SETTINGS))
+        self.editors_data = meta.get("editors", [])
+        self.reqs_data = meta.get("requirements", [])
+        self.level_files = [fname for (fname,) in self.db.execute("SELECT fname FROM ordering ORDER BY position")]
+
+        self._pending.clear()
+        self._deleted.clear()
+        self._order_dirty = False
+        self._parsed.clear()
+        self._replay_journal()
+
+    def _write_order(self, order):
+        # Only positions whose level changed are rewritten
+        old = [fname for (fname,) in self.db.execute("SELECT fname FROM ordering ORDER BY position")]
+        self.db.executemany("INSERT OR REPLACE INTO ordering (position, fname) VALUES (?, ?)",
+                            [(i, fname) for i, fname in enumerate(order) if i >= len(old) or old[i] != fname])
+        self.db.execute("DELETE FROM ordering WHERE position >= ?", (len(order),))
+
+    def _write(self, file, data):
+        with self.db:
+            if file is LIST_FILE:
+                self._write_order(data)
+            else:
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                (META_KEYS[file.name], json.dumps(data)))
+        return super()._write(file, data)
+
+    def detached(self):
+        other = SQLiteStore(self.db_path, self.data_dir, self.levels)
+        other._hash_cache = self._hash_cache
+        other.settings_data = copy.deepcopy(self.settings_data)
+        other.level_files = list(self.level_files)
+        other.editors_data = copy.deepcopy(self.editors_data)
+        other.reqs_data = list(self.reqs_data)
+        return other
+
+    # --- Levels ---
+    def _read_level(self, fname):
+        row = self.db.execute("SELECT data FROM levels WHERE fname = ?", (fname,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        if data.get("records") == []:
+            # Filling the stored placeholder keeps the key where it was in the file
+            data["records"] = [json.loads(r) for (r,) in self.db.execute(
+                "SELECT data FROM records WHERE fname = ? ORDER BY position", (fname,))]
+        return data
+
+    def _write_level(self, fname, data):
+        records = data.get("records")
+        stored = dict(data)
+        if isinstance(records, list):
+            stored["records"] = []
+        else:
+            records = []  # not a list: kept as-is inside `data`
+        self.db.execute("INSERT OR REPLACE INTO levels (fname, name, author, verifier, level_id, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (fname, str(data.get("name", "")), str(data.get("author", "")),
+                         str(data.get("verifier", "")), data.get("id") if isinstance(data.get("id"), int) else None,
+                         json.dumps(stored)))
+        self.db.execute("DELETE FROM level_people WHERE fname = ?", (fname,))
+        people = [("author", data.get("author")), ("verifier", data.get("verifier"))]
+        if isinstance(data.get("creators"), list):
+            people += [("creator", c) for c in data["creators"]]
+        self.db.executemany("INSERT INTO level_people (fname, role, name, name_key) VALUES (?, ?, ?, ?)",
+                            [(fname, role, str(name), _name_key(name)) for role, name in people if name])
+        self.db.execute("DELETE FROM records WHERE fname = ?", (fname,))
+        self.db.executemany(
+            "INSERT INTO records (fname, position, user, user_key, percent, data) VALUES (?, ?, ?, ?, ?, ?)",
+            [(fname, i, str(r.get("user", "")), _name_key(r.get("user", "")),
+              r.get("percent") if isinstance(r.get("percent"), int) else None, json.dumps(r))
+             if isinstance(r, dict) else (fname, i, None, None, None, json.dumps(r))
+             for i, r in enumerate(records)])
+
+    def _delete_level(self, fname):
+        for table in ("levels", "level_people", "records"):
+            self.db.execute(f"DELETE FROM {table} WHERE fname = ?", (fname,))
+
+    def level(self, fname):
+        if fname in self._pending:
+            return self._pending[fname]
+        if fname in self._deleted:
+            return None
+        self._check_external_changes()
+        if fname not in self._parsed:
+            self._parsed[fname] = self._read_level(fname)
+        return self._parsed[fname]
+
+    def flush(self):
+        with self.db:
+            for fname in self._deleted:
+                self._delete_level(fname)
+                self._parsed.pop(fname, None)
+            for fname, data in self._pending.items():
+                self._write_level(fname, data)
+                self._parsed[fname] = data
+        return super().flush()
+
+    # --- Queries ---
+    def records_of(self, user):
+        """Every record of `user` (any case) as (rank or None, fname, record), best rank first."""
+        rows = self.db.execute(
+            "SELECT o.position, r.fname, r.data FROM records r LEFT JOIN ordering o ON o.fname = r.fname "
+            "WHERE r.user_key = ? ORDER BY o.position IS NULL, o.position, r.position", (_name_key(user),))
+        return [(None if pos is None else pos + 1, fname, json.loads(data)) for pos, fname, data in rows]
+
+    def levels_of(self, name):
+        """Levels `name` made or verified, as (rank or None, fname, role)."""
+        rows = self.db.execute(
+            "SELECT o.position, p.fname, p.role FROM level_people p LEFT JOIN ordering o ON o.fname = p.fname "
+            "WHERE p.name_key = ? ORDER BY o.position IS NULL, o.position", (_name_key(name),))
+        return [(None if pos is None else pos + 1, fname, role) for pos, fname, role in rows]
+
+    # --- Import / export ---
+    def import_json(self):
+        """Replace the database contents with data/. Returns the number of levels.
+
+        Every level file is imported, listed or not, so an export gives the
+        same folder back. Refuses to import if a level file is not valid JSON.
+        """
+        files = ListStore(self.data_dir)
+        files.load()
+        levels, invalid = {}, []
+        for path in sorted(self.data_dir.glob("*.json")):
+            if path.name.startswith("_"):
+                continue
+            data = read_json(path)
+            if isinstance(data, dict):
+                levels[path.stem] = data
+            else:
+                invalid.append(path.name)
+        if invalid:
+            raise ValueError(f"Not valid level JSON, fix or remove first: {', '.join(invalid)}")
+        with self.db:
+            for table in ("meta", "levels", "level_people", "records", "ordering"):
+                self.db.execute(f"DELETE FROM {table}")
+            for file, data in ((SETTINGS_FILE, files.settings_data), (EDITORS_FILE, files.editors_data),
+                               (REQS_FILE, files.reqs_data)):
+                self.db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (META_KEYS[file.name], json.dumps(data)))
+            for fname, data in levels.items():
+                self._write_level(fname, data)
+            self.db.executemany("INSERT INTO ordering (position, fname) VALUES (?, ?)", enumerate(files.level_files))
+        self._parsed.clear()
+        self.levels.clear()
+        return len(levels)
+
+    def export_json(self):
+        """Write data/ from the database; returns (written, removed) file names.
+
+        Files already matching are left alone, and level files that are not in
+        the database are removed, so data/ ends up exactly what the site reads.
+        """
+        self.load()
+        written = self.save()
+        names = set()
+        for (fname,) in self.db.execute("SELECT fname FROM levels"):
+            names.add(fname)
+            if write_if_changed(self.levels.path(fname), dump_json(self.level(fname))):
+                written.append(f"{fname}.json")
+        removed = []
+        for path in sorted(self.data_dir.glob("*.json")):
+            if not path.name.startswith("_") and path.stem not in names:
+                path.unlink()
+                removed.append(path.name)
+        self.levels.clear()
+        return written, removed
+
+    # --- Backups restore files, so the database is re-imported afterwards ---
+    def restore_snapshot(self, snap_id, level=None, progress=None):
+        result = super().restore_snapshot(snap_id, level, progress)
+        self.import_json()
+        self.load()
+        return result
+
+    def restore(self, backup_path):
+        super().restore(backup_path)
+        self.import_json()
+        self.load()
+
+# --- Deploy ---
+class DeployError(Exception):
+    pass
+
+def _run_git(args, cwd, on_line=None):
+    """Run git, passing each output line to `on_line` as it arrives.
+
+    Returns (returncode, output, seconds).
+    """
+    start = time.perf_counter()
+    try:
+        proc = subprocess.Popen(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        raise DeployError("Git is not installed or not found in PATH.")
+    lines = []
+    # Text mode splits on \r too, so push progress comes through live
+    for line in proc.stdout:
+        line = line.rstrip()
+        if line:
+            lines.append(line)
+            if on_line:
+                on_line(line)
+    proc.wait()
+    return proc.returncode, "\n".join(lines), time.perf_counter() - start
+
+def changed_data_files(manifest, last_manifest):
+    """Names of data files added, changed or removed between two manifests."""
+    return sorted(name for name in set(manifest) | set(last_manifest)
+                  if manifest.get(name) != last_manifest.get(name))
+
+def deploy_site(repo_dir, repo_url, data_dir=DATA_DIR, branch="main", progress=None):
+    """Commit and push the data files that changed since the last deploy.
+
+    Changes are found by comparing `_manifest.json` with the manifest saved
+    at the last successful push (DEPLOY_STATE_FILE). Only those files, their
+    .gz copies and the manifest are staged; when nothing changed and the
+    last commit is already pushed, nothing runs at all. The first commit of
+    a new repository holds the whole site. Pushes are never forced, so a
+    remote with commits the folder lacks raises DeployError instead of
+    being overwritten. `progress(text)` gets every step and git output line
+    as it happens. Returns (log lines, pushed).
+    """
+    repo_dir = Path(repo_dir)
+    data_dir = Path(data_dir)
+    report = progress or (lambda text: None)
+    log = []
+
+    def git(*args, check=True):
+        report(f"> git {' '.join(args[:3])}")
+        code, output, seconds = _run_git(args, repo_dir, lambda line: report(f"  {line}"))
+        log.append(f"> git {' '.join(args)}  ({seconds:.2f}s)")
+        if output:
+            log.append(output)
+        if check and code != 0:
+            raise DeployError(f"git {args[0]} failed:\n{output}")
+        return code, output.strip()
+
+    git("--version")
+
+    if not (repo_dir / ".git").exists():
+        git("init")
+        git("branch", "-M", branch, check=False)
+
+    code, current_remote = git("remote", "get-url", "origin", check=False)
+    if code != 0:
+        current_remote = ""
+    if current_remote != repo_url:
+        if current_remote:
+            git("remote", "remove", "origin")
+        git("remote", "add", "origin", repo_url)
+
+    manifest = read_json(data_dir / MANIFEST_FILE.name) or build_manifest(data_dir)
+    state_path = repo_dir / DEPLOY_STATE_FILE
+    state = read_json(state_path, {})
+    if state.get("remote") != repo_url:
+        state = {}
+    changed = changed_data_files(manifest, state.get("manifest", {}))
+
+    paths = []
+    for name in changed + ([MANIFEST_FILE.name] if changed else []):
+        paths.append(data_dir / name)
+        if (data_dir / f"{name}.gz").exists():
+            paths.append(data_dir / f"{name}.gz")
+    paths = [os.path.relpath(p, repo_dir) for p in paths]
+
+    code, head = git("rev-parse", "--verify", "-q", "HEAD", check=False)
+    has_head = code == 0
+    if not paths and has_head and state.get("pushed") == head:
+        report("Nothing changed since the last deploy")
+        log.append("Nothing changed since the last deploy, skipped commit and push.")
+        return log, False
+
+    if not has_head:
+        # A new repository: a commit of data/ alone would push a site without its pages
+        report("Staging the whole site for the first commit")
+        git("add", "-A")
+    elif paths:
+        report(f"Staging {len(paths)} changed file(s)")
+        git("add", "-A", "--", *paths)
+    code, _ = git("diff", "--cached", "--quiet", check=False)
+    if code == 1:
+        git("commit", "-m", f"Update site data {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    code, head = git("rev-parse", "--verify", "-q", "HEAD", check=False)
+    if code != 0:
+        log.append("Nothing has been committed yet, nothing to push.")
+        return log, False
+    if state.get("pushed") != head:
+        code, output = git("push", "-u", "origin", f"HEAD:{branch}", check=False)
+        if code != 0:
+            raise DeployError(f"git push was rejected:\n{output}\n\n"
+                              f"The repository on GitHub has commits this folder does not have. Get them first "
+                              f"(git pull --rebase origin {branch}), or clone the repository and copy data/ into it, then deploy again.")
+
+    atomic_write(state_path, dump_json({"remote": repo_url, "pushed": head, "manifest": manifest}))
+    return log, True
+
+# --- Bulk record import ---
+def iter_submissions(path):
+    """Yield (line number, submission dict or None) from a JSONL or CSV file.
+
+    Lines are read one at a time, so the file size does not matter. CSV files
+    need a header row (level,user,percent,hz,link,mobile).
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                submission = json.loads(line)
+            except ValueError:
+                submission = None
+            yield lineno, submission if isinstance(submission, dict) else None
+
+def _parse_flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+def import_records(store, path):
+    """Add every valid, new record from a submissions file to `store`.
+
+    Records are grouped per level in memory and nothing is written here;
+    call `store.flush()` to write each touched level once. A submission is
+    a duplicate if the level already has a record with the same user
+    (case-insensitive) and percent. Returns a report dict with accepted /
+    rejected counts, rejection reasons and the touched levels.
+    """
+    rejected = Counter()
+    accepted = 0
+    touched = []
+    seen = {}  # fname -> {(user, percent)} for levels we touched
+    names = None  # lowercased level name -> fname, built on first miss
+    listed = set(store.level_files)
+
+    for lineno, sub in iter_submissions(path):
+        if sub is None:
+            rejected["malformed line"] += 1
+            continue
+
+        level_ref = str(sub.get("level") or "").strip()
+        fname = level_ref if level_ref in listed else None
+        if fname is None and level_ref:
+            if names is None:
+                names = {}
+                for f in store.level_files:
+                    data = store.level(f)
+                    if data:
+                        names.setdefault(str(data.get("name", "")).lower(), f)
+            fname = names.get(level_ref.lower())
+        if fname is None:
+            rejected["unknown level"] += 1
+            continue
+
+        user = str(sub.get("user") or "").strip()
+        if not user:
+            rejected["missing user"] += 1
+            continue
+        try:
+            percent = int(sub.get("percent"))
+            hz = int(sub.get("hz") or 360)
+        except (TypeError, ValueError):
+            rejected["percent/hz not a number"] += 1
+            continue
+        if not 0 < percent <= 100:
+            rejected["percent out of range"] += 1
+            continue
+
+        data = store.level(fname)
+        if data is None:
+            rejected["level file invalid"] += 1
+            continue
+        if percent < data.get("percentToQualify", 0):
+            rejected["below percent to qualify"] += 1
+            continue
+
+        keys = seen.get(fname)
+        if keys is None:
+            keys = seen[fname] = {(str(r.get("user", "")).lower(), r.get("percent")) for r in data.get("records") or []}
+            touched.append(fname)
+        key = (user.lower(), percent)
+        if key in keys:
+            rejected["duplicate"] += 1
+            continue
+        keys.add(key)
+
+        store.add_record(fname, user, percent, hz, str(sub.get("link") or ""), _parse_flag(sub.get("mobile")))
+        accepted += 1
+
+    return {
+        "accepted": accepted,
+        "rejected": sum(rejected.values()),
+        "reasons": dict(rejected),
+        "levels": touched,
+    }
+
+def read_order_file(path):
+    """Level filenames from a text file (one per line, # for comments) or a JSON list like _list.json."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        order = json.loads(text)
+        if not all(isinstance(fname, str) for fname in order):
+            raise ValueError(f"{path}: the JSON list must hold level filenames")
+        return order
+    order = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            order.append(line[:-len(".json")] if line.endswith(".json") else line)
+    return order
+
+def format_import_report(report):
+    lines = [f"Accepted: {report['accepted']}, rejected: {report['rejected']}, levels touched: {len(report['levels'])}"]
+    for reason, count in sorted(report["reasons"].items(), key=lambda kv: -kv[1]):
+        lines.append(f"  {reason}: {count}")
+    return "\n".join(lines)
+
+# --- Records editor ---
+RECORD_COLUMNS = (("#", 50), ("user", 180), ("percent", 70), ("hz", 60), ("mobile", 60), ("link", 280))
+
+def parse_record_lines(text):
+    """Parse pasted records, one per line: user, percent[, hz[, link[, mobile]]].
+
+    Tab-separated rows pasted from a spreadsheet work too. Returns
+    (records, errors) with errors as "line N: reason" strings.
+    """
+    records, errors = [], []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        fields = line.split("\t") if "\t" in line else next(csv.reader([line], skipinitialspace=True))
+        fields = [f.strip() for f in fields] + [""] * 5
+        user, percent, hz, link, mobile = fields[:5]
+        if not user:
+            errors.append(f"line {lineno}: missing user")
+            continue
+        try:
+            percent = int(percent)
+            hz = int(hz or 360)
+        except ValueError:
+            errors.append(f"line {lineno}: percent/hz not a number")
+            continue
+        if not 0 < percent <= 100:
+            errors.append(f"line {lineno}: percent out of range")
+            continue
+        records.append({"user": user, "link": link, "percent": percent, "hz": hz, "mobile": _parse_flag(mobile)})
+    return records, errors
+
+class LevelRecords:
+    """The records of one level while it is being edited.
+
+    `records` is changed in place. `users` maps a user's key (name stripped,
+    then folded like `_name_key`) to the positions of their records, so
+    duplicates are found without a scan.
+    `order` is the sorted view; sorting never changes the saved order.
+    """
+
+    SORT_KEYS = {
+        "#": None,
+        "user": lambda r: str(r.get("user", "")).lower(),
+        "percent": lambda r: r.get("percent", 0),
+        "hz": lambda r: r.get("hz", 0),
+        "mobile": lambda r: bool(r.get("mobile")),
+        "link": lambda r: str(r.get("link", "")),
+    }
+
+    @staticmethod
+    def _key(user):
+        return _name_key(str(user).strip())
+
+    def __init__(self, records):
+        self.records = records
+        self.sort_column = "#"
+        self.sort_reverse = False
+        self._reindex()
+
+    def _reindex(self):
+        self.users = {}
+        for i, record in enumerate(self.records):
+            self.users.setdefault(self._key(record.get("user", "")), []).append(i)
+        self._resort()
+
+    def _resort(self):
+        key = self.SORT_KEYS[self.sort_column]
+        positions = range(len(self.records))
+        if key is None:
+            self.order = list(reversed(positions)) if self.sort_reverse else list(positions)
+        else:
+            self.order = sorted(positions, key=lambda i: key(self.records[i]), reverse=self.sort_reverse)
+
+    def sort(self, column, reverse=False):
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self._resort()
+
+    def row(self, i):
+        r = self.records[i]
+        return (i + 1, r.get("user", ""), r.get("percent", ""), r.get("hz", ""),
+                "yes" if r.get("mobile") else "", r.get("link", ""))
+
+    def records_of(self, user):
+        return self.users.get(self._key(user), [])
+
+    def is_duplicate(self, i):
+        return len(self.users.get(self._key(self.records[i].get("user", "")), ())) > 1
+
+    def duplicate_users(self):
+        return sum(1 for positions in self.users.values() if len(positions) > 1)
+
+    def add(self, records, skip_duplicates=False):
+        """Append `records`; returns the users skipped as duplicates."""
+        skipped = []
+        for record in records:
+            key = self._key(record.get("user", ""))
+            if skip_duplicates and key in self.users:
+                skipped.append(record.get("user", ""))
+                continue
+            self.users.setdefault(key, []).append(len(self.records))
+            self.records.append(record)
+        self._resort()
+        return skipped
+
+    def delete(self, positions):
+        drop = set(positions)
+        self.records[:] = [r for i, r in enumerate(self.records) if i not in drop]
+        self._reindex()
+
+    def edit(self, positions, field, value):
+        for i in positions:
+            self.records[i][field] = value
+        if field == "user":
+            self._reindex()
+        else:
+            self._resort()
+
+# --- Background work for the manager window ---
+class TaskCancelled(Exception):
+    pass
+
+class Task:
+    """Handle given to a background job: report progress, check for cancel."""
+
+    def __init__(self, name, results):
+        self.name = name
+        self._results = results
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def progress(self, text):
+        """Show `text` in the status bar (from any thread); raises if cancelled."""
+        self.check()
+        self._results.put(("progress", self, text, None))
+
+    def counter(self, verb):
+        # progress(done, total) callback for the store helpers
+        return lambda done, total: self.progress(f"{verb} {done}/{total}")
+
+class DataWatcher:
+    """Polls data/ for files changed by something other than the manager.
+
+    Only mtime and size are compared, so nothing outside the standard
+    library is needed. The poll interval grows while nothing changes and
+    drops back to the minimum after a change.
+    """
+
+    GENERATED = {BUNDLE_FILE.name, MANIFEST_FILE.name, LEADERBOARD_FILE.name, LIST_INDEX_FILE.name,
+                 ROULETTE_FILE.name}
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.interval = WATCH_MIN_MS
+        self._seen = None  # file name -> (mtime_ns, size)
+
+    def _stat_all(self):
+        seen = {}
+        try:
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    if (entry.name.endswith(".json") and entry.name not in self.GENERATED
+                            and not entry.name.startswith("_list.page-")):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        seen[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return seen
+
+    def reset(self):
+        """Take the current state as the baseline."""
+        self._seen = self._stat_all()
+        self.interval = WATCH_MIN_MS
+
+    def scan(self):
+        """Return what changed since the last scan, or None.
+
+        The result has "added", "changed" and "removed" level filenames and
+        "list", which is True when `_list.json` changed.
+        """
+        if self._seen is None:
+            self.reset()
+            return None
+        old, seen = self._seen, self._stat_all()
+        self._seen = seen
+        added = seen.keys() - old.keys()
+        removed = old.keys() - seen.keys()
+        changed = {name for name in seen.keys() & old.keys() if seen[name] != old[name]}
+        if not (added or removed or changed):
+            self.interval = min(WATCH_MAX_MS, int(self.interval * 1.5))
+            return None
+        self.interval = WATCH_MIN_MS
+
+        def levels(names):
+            return sorted(name[:-len(".json")] for name in names if not name.startswith("_"))
+        return {
+            "added": levels(added),
+            "changed": levels(changed),
+            "removed": levels(removed),
+            "list": LIST_FILE.name in (added | removed | changed),
+        }
+
+class BackgroundTasks:
+    """Thread pool for disk and git work started from the Tk window.
+
+    Jobs never touch Tk. Their progress and results go through a thread-safe
+    queue that the Tk loop drains with `after`, and callbacks run on the Tk
+    thread. There is a single worker, so saves, builds and deploys run in
+    the order they were started.
+    """
+
+    def __init__(self, root, on_status, perf=None):
+        self._root = root
+        self._on_status = on_status
+        self._perf = perf
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="manager-io")
+        self._results = queue.Queue()
+        self.running = []
+        self._polling = False
+
+    def submit(self, name, job, on_done=None, on_error=None):
+        """Run `job(task)` in the background.
+
+        `on_done(result)` / `on_error(exception)` are called on the Tk thread;
+        without `on_error` the error is shown in a message box.
+        """
+        task = Task(name, self._results)
+        if self._perf:
+            job = self._perf.profiled(job)
+
+        def run():
+            try:
+                task.check()
+                result = job(task)
+            except TaskCancelled:
+                self._results.put(("cancelled", task, None, None))
+            except Exception as e:
+                self._results.put(("error", task, e, on_error))
+            else:
+                self._results.put(("done", task, result, on_done))
+
+        self.running.append(task)
+        self._on_status(f"{name}...")
+        self._pool.submit(run)
+        if not self._polling:
+            self._polling = True
+            self._root.after(TASK_POLL_MS, self._poll)
+        return task
+
+    def cancel_all(self):
+        for task in self.running:
+            task.cancel()
+
+    def _poll(self):
+        status = None
+        while True:
+            try:
+                kind, task, value, callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                status = f"{value} (Esc to cancel)"
+                continue
+            self.running.remove(task)
+            status = None
+            if kind == "cancelled":
+                self._on_status(f"{task.name}: cancelled")
+            elif kind == "error":
+                self._on_status(f"{task.name}: failed")
+                if callback:
+                    callback(value)
+                else:
+                    messagebox.showerror(task.name, str(value))
+            elif callback:
+                callback(value)
+        if status:
+            self._on_status(status)
+        if self.running:
+            self._root.after(TASK_POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+class OpStats:
+    """Count and duration of the window's operations, plus opt-in profiling.
+
+    Background operations are timed from the click to their result, which
+    is what the user waits for. `measure` times code on the Tk thread.
+    """
+
+    def __init__(self, on_record=None):
+        self.stats = {}  # name -> [count, total seconds, longest]
+        self._on_record = on_record
+        self._profiles = None  # cProfile.Profile objects while capturing
+
+    def record(self, name, seconds):
+        entry = self.stats.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        if self._on_record:
+            self._on_record(name, seconds)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self):
+        lines = [f"{'Operation':<22}{'Count':>7}{'Total':>10}{'Average':>11}{'Longest':>11}"]
+        for name, (count, total, longest) in sorted(self.stats.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"{name:<22}{count:>7}{total:>9.2f}s{total / count * 1000:>9.1f}ms{longest * 1000:>9.1f}ms")
+        return "\n".join(lines)
+
+    @property
+    def profiling(self):
+        return self._profiles is not None
+
+    def start_profile(self):
+        profile = cProfile.Profile()
+        self._profiles = [profile]
+        profile.enable()
+
+    def profiled(self, job):
+        """Wrap a background job so it is profiled too while capturing."""
+        # Before 3.12 cProfile only sees the thread that enabled it; from
+        # 3.12 the main profiler covers every thread and a second one fails.
+        if sys.version_info >= (3, 12):
+            return job
+
+        def run(*args):
+            if self._profiles is None:
+                return job(*args)
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(job, *args)
+            finally:
+                if self._profiles is not None:
+                    self._profiles.append(profile)
+        return run
+
+    def stop_profile(self, path):
+        """Stop capturing and write the combined stats to `path` (pstats format)."""
+        profiles, self._profiles = self._profiles, None
+        profiles[0].disable()
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+
+def level_display(i, fname, data):
+    """Text of row `i` in the levels list."""
+    if data is None:
+        return f"#{i+1} - {fname} (Error loading JSON)"
+    name = data.get('name', 'Unknown')
+    return f"#{i+1} - {name} ({fname})"
+
+class RecordTable(ttk.Frame if tk else object):
+    """Treeview of a `LevelRecords` that only holds items for the rows on screen.
+
+    Scrolling rewrites the values of those few items, so a level with
+    thousands of records opens and scrolls instantly. Since items are
+    reused, the selection is kept as record positions in `selected`.
+    """
+
+    def __init__(self, parent, records):
+        super().__init__(parent)
+        self.records = records
+        self.selected = set()
+        self.offset = 0
+        self._items = []
+        self._rows = []  # record position shown by each item
+        self._row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _ in RECORD_COLUMNS], show="headings", selectmode="extended")
+        for col, width in RECORD_COLUMNS:
+            self.tree.heading(col, text=col.title(), command=lambda c=col: self.sort(c))
+            self.tree.column(col, width=width, stretch=(col == "link"))
+        self.tree.tag_configure("duplicate", background="#ffe0e0")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self.render())
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self._page_size()))
+        self.tree.bind("<Next>", lambda e: self.scroll(self._page_size()))
+        self.tree.bind("<Control-a>", lambda e: self.select_all())
+
+    def _page_size(self):
+        # One row less for the headings
+        return max(1, self.tree.winfo_height() // self._row_height - 1)
+
+    def render(self):
+        order = self.records.order
+        size = self._page_size()
+        self.offset = max(0, min(self.offset, len(order) - size))
+        rows = order[self.offset:self.offset + size]
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert("", "end"))
+        while len(self._items) > len(rows):
+            self.tree.delete(self._items.pop())
+        for item, i in zip(self._items, rows):
+            self.tree.item(item, values=self.records.row(i),
+                           tags=("duplicate",) if self.records.is_duplicate(i) else ())
+        self._rows = rows
+        self.tree.selection_set([item for item, i in zip(self._items, rows) if i in self.selected])
+        if order:
+            self.scrollbar.set(self.offset / len(order), (self.offset + len(rows)) / len(order))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def refresh(self):
+        """Redraw after the records changed; positions past the end are unselected."""
+        self.selected = {i for i in self.selected if i < len(self.records.records)}
+        self.render()
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.records.order))
+            self.render()
+        else:
+            self.scroll(int(amount) * (self._page_size() if unit == "pages" else 1))
+
+    def _on_click(self, event):
+        # A plain click starts a new selection, also dropping rows scrolled away
+        if not event.state & 0x5 and self.tree.identify_region(event.x, event.y) != "heading":  # Shift / Control
+            self.selected.clear()
+
+    def _on_select(self, event=None):
+        shown = dict(zip(self._items, self._rows))
+        self.selected -= set(self._rows)
+        self.selected.update(shown[item] for item in self.tree.selection() if item in shown)
+
+    def select_all(self):
+        self.selected = set(range(len(self.records.records)))
+        self.render()
+        return "break"
+
+    def sort(self, column):
+        reverse = column == self.records.sort_column and not self.records.sort_reverse
+        self.records.sort(column, reverse)
+        for col, _ in RECORD_COLUMNS:
+            arrow = (" ▼" if reverse else " ▲") if col == column else ""
+            self.tree.heading(col, text=col.title() + arrow)
+        self.render()
+
+class ListManager(tk.Tk if tk else object):
+    def __init__(self, data_dir=DATA_DIR, db_path=None):
+        started = time.perf_counter()
         super().__init__()
         self.title("GDPS List Manager - Ultimate Edition")
         self.geometry("1000x800")
@@ -28,199 +2589,639 @@ class ListManager(tk.Tk):
         # Menu Bar
         menubar = tk.Menu(self)
         self.config(menu=menubar)
-        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu = self.file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Reload Data", command=self.load_data)
         file_menu.add_command(label="Backup Data", command=self.backup_data)
         file_menu.add_command(label="Restore Backup", command=self.restore_backup)
         file_menu.add_separator()
+        file_menu.add_command(label="Build Site Bundle", command=self.build_site)
+        file_menu.add_command(label="Import Records...", command=self.import_records)
+        file_menu.add_command(label="Import Order...", command=self.import_order)
+        file_menu.add_command(label="Cancel Running Task", command=self.cancel_tasks, accelerator="Esc")
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
+        self.bind("<Escape>", lambda e: self.cancel_tasks())
+        edit_menu = self.edit_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", command=self.undo, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=self.redo, accelerator="Ctrl+Y")
+        for key, command in (("<Control-z>", self.undo), ("<Control-Z>", self.undo),
+                             ("<Control-y>", self.redo), ("<Control-Y>", self.redo)):
+            # Text fields keep their own Ctrl+Z
+            self.bind(key, lambda e, command=command: None if isinstance(e.widget, (tk.Entry, tk.Text)) else command())
+        self.perf_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Performance", menu=self.perf_menu)
+        self.perf_menu.add_command(label="Show Timings", command=self.show_timings)
+        self.perf_menu.add_command(label="Reset Timings", command=lambda: self.perf.stats.clear())
+        self.perf_menu.add_separator()
+        self.perf_menu.add_command(label="Start Profiling", command=self.toggle_profiling)
+
+        # Status Bar, with the time of the last operation on the right
+        status_bar = ttk.Frame(self)
+        status_bar.pack(side="bottom", fill="x")
+        self.status = ttk.Label(status_bar, text="Ready", relief=tk.SUNKEN, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True)
+        self.perf_label = ttk.Label(status_bar, text="", relief=tk.SUNKEN, anchor="e", width=34)
+        self.perf_label.pack(side="right")
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(expand=True, fill="both")
 
-        self.init_settings_tab()
-        self.init_levels_tab()
-        self.init_editors_tab()
-        self.init_reqs_tab()
-        
+        self.store = SQLiteStore(db_path, data_dir) if db_path else ListStore(data_dir)
+        self.store.open_journal()
+        self.search_index = LevelSearchIndex()
+        self.player_index = PlayerIndex()
+        self.perf = OpStats(lambda name, seconds: self.perf_label.config(text=f"{name}: {seconds * 1000:.0f} ms"))
+        self.tasks = BackgroundTasks(self, self.set_status, self.perf)
+        self.visible_rows = []  # listbox row -> index into self.store.level_files
+        self._filter_job = None
+        self.watcher = DataWatcher(self.store.data_dir)
+        self._saved_order = []  # _list.json as last loaded or saved by the window
+        self._open_editors = {}  # fname -> open edit_level_dialog window
+        self._build_job = None  # pending after() that writes journaled edits
+        self._drag = None  # [pressed row, row under the mouse] while dragging levels
+        self._loading = None  # level files being read and indexed, see load_data
+        self._load_job = None  # pending after() of _load_levels_step
+        self.loaded = False  # data/ was read; nothing is saved or built before that
+        self._needs_data = []  # buttons that write data/, see _set_loaded
+
+        # Tabs are empty frames until they are first shown
+        self.built_tabs = set()
+        self._unbuilt_tabs = {}  # frame path -> (frame, init method)
+        self._add_tab("Site Settings", self.init_settings_tab)
+        self._add_tab("Levels", self.init_levels_tab)
+        self._add_tab("Editors", self.init_editors_tab)
+        self._add_tab("Requirements", self.init_reqs_tab)
+        self._add_tab("Players", self.init_players_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._build_selected_tab)
+        self._build_selected_tab()
+
         self.load_data()
+        if not isinstance(self.store, SQLiteStore):  # there the database is the source, not data/
+            self.after(WATCH_MIN_MS, self._watch)
+        # Time until the window is drawn and takes input; levels keep loading after that
+        self.after_idle(lambda: self.perf.record("startup", time.perf_counter() - started))
 
-    def load_data(self):
-        # Ensure directories
-        DATA_DIR.mkdir(exist_ok=True)
-        BACKUP_DIR.mkdir(exist_ok=True)
-
-        # Settings
-        if SETTINGS_FILE.exists():
-            with open(SETTINGS_FILE, "r") as f:
-                self.settings_data = json.load(f)
-        else:
-            self.settings_data = {
-                "title": "CCL - GDPS List",
-                "primary_color": "#003366",
-                "telegram_link": "https://t.me/chaigdpscl",
-                "submit_link": "#",
-                "list_name_header": "CCL"
-            }
-        
-        # List Order
-        if LIST_FILE.exists():
-            with open(LIST_FILE, "r") as f:
-                self.level_files = json.load(f)
-        else:
-            self.level_files = []
+    def _add_tab(self, text, init):
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self._unbuilt_tabs[str(frame)] = (frame, init)
 
-        # Editors
-        if EDITORS_FILE.exists():
-            with open(EDITORS_FILE, "r") as f:
-                self.editors_data = json.load(f)
-        else:
-            self.editors_data = []
+    def _build_selected_tab(self, event=None):
+        pending = self._unbuilt_tabs.pop(self.notebook.select(), None)
+        if pending is not None:
+            frame, init = pending
+            with self.perf.measure("build_tab"):
+                init(frame)
 
-        # Requirements
-        if REQS_FILE.exists():
-            with open(REQS_FILE, "r") as f:
-                self.reqs_data = json.load(f)
-        else:
-            self.reqs_data = []
+    def set_status(self, text):
+        self.status.config(text=text)
 
-        self.refresh_settings_ui()
+    def _set_loaded(self, loaded):
+        # Editing, saving, building and deploying stay off until a load
+        # succeeded, so a failed or cancelled load never writes an empty list
+        # over data/, and no edit is journaled before the journal is read
+        self.loaded = loaded
+        state = "normal" if loaded else "disabled"
+        for label in ("Build Site Bundle", "Import Records...", "Import Order..."):
+            self.file_menu.entryconfig(label, state=state)
+        for label in ("Undo", "Redo"):
+            self.edit_menu.entryconfig(label, state=state)
+        for button in self._needs_data:
+            button.state(["!disabled"] if loaded else ["disabled"])
+
+    def _check_loaded(self):
+        # For the shortcuts, double-clicks and drags that reach edits past the disabled buttons
+        if not self.loaded:
+            self.set_status("The list is still loading; edits are possible once it is loaded")
+        return self.loaded
+
+    def _data_button(self, parent, text, command):
+        button = ttk.Button(parent, text=text, command=command, state="normal" if self.loaded else "disabled")
+        self._needs_data.append(button)
+        return button
+
+    def cancel_tasks(self):
+        self.tasks.cancel_all()
+
+    # --- Changes made outside the manager ---
+    def _watch(self):
+        # Skipped while our own jobs write; those writes are recognised afterwards
+        if not self.tasks.running:
+            changes = self.watcher.scan()
+            if changes:
+                self._apply_external_changes(changes)
+        self.after(self.watcher.interval, self._watch)
+
+    def _apply_external_changes(self, changes):
+        cache = self.store.levels
+        listed = set(self.store.level_files)
+        # Files the manager wrote itself are skipped
+        levels = [f for f in changes["added"] + changes["changed"] if not cache.wrote(f)]
+        levels += [f for f in changes["removed"] if f in listed]
+        unsaved = [f for f in levels if self.store.pending(f)]
+        if unsaved:
+            # The next build would write our version over theirs, so ask first
+            self._cancel_build()
+            names = ", ".join(f"{f}.json" for f in unsaved[:5]) + (f" and {len(unsaved) - 5} more" if len(unsaved) > 5 else "")
+            if messagebox.askyesno("Changed on Disk", f"{names} changed outside the manager, and you have unsaved changes to {'it' if len(unsaved) == 1 else 'them'}.\n\n"
+                                   "Load the version from disk? (No keeps yours; saving will overwrite the file.)"):
+                for fname in unsaved:
+                    self.store.discard(fname)
+            if self.store.dirty:
+                self._schedule_build()
+        for fname in levels:
+            data = self.store.level(fname)
+            self.search_index.update(fname, data)
+            self.player_index.update(fname, data)
+            win = self._open_editors.get(fname)
+            if win is not None:
+                messagebox.showwarning("Changed on Disk", f"{fname}.json was changed outside the manager while you are editing it.\n"
+                                       "Close without saving and reopen it to see the new version, or saving will ask before overwriting it.", parent=win)
+
+        if not (changes["list"] and self._reload_list_order()):
+            self._update_level_rows(levels)
+        listed = set(self.store.level_files)
+        unlisted = [f for f in changes["added"] if f not in listed]
+        if levels or unlisted:
+            note = f", new file(s) not on the list: {', '.join(unlisted)}" if unlisted else ""
+            self.set_status(f"Reloaded {len(levels)} level(s) changed on disk{note}")
+
+    def _reload_list_order(self):
+        """Adopt a `_list.json` changed on disk; returns True if the list was redrawn."""
+        order = read_json(self.store.data_dir / LIST_FILE.name)
+        if not isinstance(order, list) or order == self._saved_order:
+            return False  # unreadable mid-write, or our own save
+        if self.store.level_files != self._saved_order:
+            if not messagebox.askyesno("List Changed on Disk", "_list.json was changed outside the manager, and you have unsaved changes to the order.\n\n"
+                                       "Load the order from disk? (No keeps yours; saving will overwrite the file.)"):
+                self._saved_order = order
+                return False
+        known = set(self.store.level_files)
+        self.store.level_files = list(order)
+        self._saved_order = order
+        for fname in order:
+            if fname not in known:
+                data = self.store.level(fname)
+                self.search_index.update(fname, data)
+                self.player_index.update(fname, data)
         self.refresh_levels_list()
-        self.refresh_editors_ui()
-        self.refresh_reqs_ui()
+        self.set_status(f"Reloaded list order from disk - Total Levels: {len(order)}")
+        return True
+
+    def _update_level_rows(self, fnames):
+        # Redraw just these rows; a search is redone since matches may change
+        if "levels" not in self.built_tabs:
+            return
+        if self.search_var.get():
+            self.filter_levels()
+            return
+        positions = {fname: i for i, fname in enumerate(self.store.level_files)}
+        selected = set(self.levels_listbox.curselection())
+        for fname in fnames:
+            row = positions.get(fname)
+            if row is None or row >= self.levels_listbox.size():
+                continue
+            self.levels_listbox.delete(row)
+            self.levels_listbox.insert(row, self._get_level_display(row, fname))
+            if row in selected:
+                self.levels_listbox.selection_set(row)
+
+    # --- Journal: undo, redo and writing edits out ---
+    def _schedule_build(self):
+        # Edits are already safe in the journal; data/ and the site files
+        # are written in the background once editing pauses
+        self._cancel_build()
+        self._build_job = self.after(BUILD_DELAY_MS, lambda: self.build_site(quiet=True))
+
+    def _cancel_build(self):
+        if self._build_job is not None:
+            self.after_cancel(self._build_job)
+            self._build_job = None
+
+    def _levels_changed(self, fnames, moves):
+        for fname in fnames:
+            data = self.store.level(fname)
+            if data is None:
+                self.search_index.remove(fname)
+                self.player_index.remove(fname)
+            else:
+                self.search_index.update(fname, data)
+                self.player_index.update(fname, data)
+        if moves:
+            positions = [i for _, old, new in moves for i in (old, new) if i is not None]
+            grew = any(old is None or new is None for _, old, new in moves)  # level added or deleted
+            self._redraw_rows(min(positions), None if grew else max(positions))
+        else:
+            self._update_level_rows(fnames)
+        self.refresh_players_ui()
+        self._schedule_build()
+
+    def _step_history(self, step, verb):
+        if not self._check_loaded():
+            return
+        try:
+            try:
+                entry = step()
+            except ValueError as e:
+                if not messagebox.askyesno(verb, f"{e}\n\n{verb} anyway? That also reverts those changes."):
+                    return
+                entry = step(force=True)
+        except OSError as e:
+            messagebox.showerror("Journal", f"Could not write the journal:\n{e}")
+            return
+        if entry is None:
+            self.set_status(f"Nothing to {verb.lower()}")
+            return
+        fnames = dict.fromkeys([*entry["levels"], *entry.get("fields", {}), *entry.get("records", {})])
+        self._levels_changed(list(fnames), entry["order"])
+        if entry["target"] in self._open_editors:
+            messagebox.showwarning(verb, f"{entry['target']} is open in an editor; saving it there will overwrite this {verb.lower()}.",
+                                   parent=self._open_editors[entry["target"]])
+        self.set_status(f"{verb}: {entry['op']} {entry['target']}")
+
+    def undo(self):
+        self._step_history(self.store.undo, "Undo")
+
+    def redo(self):
+        self._step_history(self.store.redo, "Redo")
+
+    # --- Performance ---
+    def _timing(self, name, callback=None):
+        """Task callback that records the time from now until the task is done."""
+        started = time.perf_counter()
+
+        def done(result):
+            self.perf.record(name, time.perf_counter() - started)
+            if callback:
+                callback(result)
+        return done
+
+    def show_timings(self):
+        win = tk.Toplevel(self)
+        win.title("Timings")
+        win.geometry("640x360")
+        text = tk.Text(win, font=("Consolas", 10))
+        text.pack(expand=True, fill="both", padx=5, pady=5)
+
+        def refresh():
+            text.delete("1.0", tk.END)
+            text.insert("1.0", self.perf.summary() if self.perf.stats else "Nothing timed yet.")
+        ttk.Button(win, text="Refresh", command=refresh).pack(pady=5)
+        refresh()
+
+    def toggle_profiling(self):
+        last = self.perf_menu.index(tk.END)
+        if not self.perf.profiling:
+            self.perf.start_profile()
+            self.perf_menu.entryconfig(last, label="Stop Profiling and Save...")
+            self.set_status("Profiling - use Performance -> Stop Profiling to save the result")
+            return
+        path = filedialog.asksaveasfilename(title="Save Profile", initialfile="manager.prof",
+                                            defaultextension=".prof", filetypes=[("Profile", "*.prof")])
+        if not path: return  # still profiling
+        self.perf.stop_profile(path)
+        self.perf_menu.entryconfig(last, label="Start Profiling")
+        messagebox.showinfo("Profiling", f"Profile saved to {path}\n\nView it with: python -m pstats \"{path}\"")
+
+    def load_data(self):
+        # The list and the small files are read in the background into a fresh
+        # store that shares the level cache, and the window switches over to it.
+        # Edits the journal holds but data/ does not (after a crash) are replayed.
+        # Level files are read next; _load_levels_step indexes and draws them
+        # in chunks as they come in.
+        started = time.perf_counter()
+        self._stop_loading()
+        self._set_loaded(False)
+        store = self.store.detached()
+        store.journal = self.store.journal
+
+        def job(task):
+            store.load()
+            return store
+
+        def read_levels(task, loading):
+            try:
+                for i, fname in enumerate(loading["files"], 1):
+                    if i % LOAD_CHUNK == 0:
+                        task.check()
+                    store.levels.get(fname)
+                    loading["read"] = i
+            finally:
+                loading["finished"] = True  # also when cancelled: the rest is read when shown
+
+        def done(store):
+            self.store = store
+            self._set_loaded(True)
+            self.search_index = LevelSearchIndex()
+            self.player_index = PlayerIndex()
+            self._saved_order = list(store.level_files)
+            self.watcher.reset()
+            loading = {"files": list(store.level_files), "read": 0, "indexed": 0,
+                       "finished": False, "started": started}
+            self._loading = loading
+            self.refresh_settings_ui()
+            self.refresh_levels_list()
+            self.refresh_editors_ui()
+            self.refresh_reqs_ui()
+            loading["task"] = self.tasks.submit("Loading levels", lambda task: read_levels(task, loading))
+            self._load_levels_step()
+
+        def failed(e):
+            self.set_status("Loading data: failed - saving is off until File -> Reload Data works")
+            messagebox.showerror("Load", f"Could not load the data:\n{e}\n\n"
+                                 "Nothing can be saved until it loads; fix the problem and use File -> Reload Data.")
+
+        self.tasks.submit("Loading data", job, self._timing("load_data", done), failed)
+
+    def _stop_loading(self):
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+        if self._loading is not None:
+            self._loading["task"].cancel()
+            self._loading = None
+
+    def _ready_rows(self):
+        # Rows that can be drawn without reading level files on the Tk thread
+        total = len(self.store.level_files)
+        return total if self._loading is None else min(self._loading["indexed"], total)
+
+    def _load_levels_step(self):
+        """Index the next chunk of levels read so far and add their rows."""
+        self._load_job = None
+        loading = self._loading
+        files = loading["files"]
+        ready = len(files) if loading["finished"] else loading["read"]
+        first = loading["indexed"]
+        last = min(ready, first + LOAD_CHUNK)
+        for fname in files[first:last]:
+            data = self.store.level(fname)
+            self.search_index.update(fname, data)
+            self.player_index.update(fname, data)
+        loading["indexed"] = last
+        if last == len(files):
+            self._loading = None
+
+        if "levels" in self.built_tabs and not self.search_var.get():
+            shown, upto = self.levels_listbox.size(), self._ready_rows()
+            if shown < upto:
+                self.levels_listbox.insert(tk.END, *[self._get_level_display(i, self.store.level_files[i])
+                                                     for i in range(shown, upto)])
+                self.visible_rows.extend(range(shown, upto))
+
+        if self._loading is not None:
+            self.set_status(f"Loading levels {last}/{len(files)}")
+            # Straight on while read levels are waiting, otherwise give the reader time
+            self._load_job = self.after(1 if last < ready else TASK_POLL_MS, self._load_levels_step)
+            return
+
+        seconds = time.perf_counter() - loading["started"]
+        self.perf.record("load_levels", seconds)
+        if "levels" in self.built_tabs and self.search_var.get():
+            self.filter_levels()  # matches among the levels that were still loading
+        self.refresh_players_ui()
+        total = len(self.store.level_files)
+        if self.store.recovered:
+            self.set_status(f"Recovered {self.store.recovered} unsaved edit(s) from the journal - Total Levels: {total}")
+            self._schedule_build()
+        else:
+            self.set_status(f"Total Levels: {total} (loaded in {seconds:.1f}s)")
 
     def backup_data(self):
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = BACKUP_DIR / f"backup_{ts}"
-        backup_path.mkdir()
-        for f in DATA_DIR.glob("*"):
-            if f.is_file():
-                shutil.copy(f, backup_path)
-        messagebox.showinfo("Backup", f"Backup created at:\n{backup_path}")
+        def done(snap_id):
+            self.set_status(f"Snapshot {snap_id} created")
+            messagebox.showinfo("Backup", f"Snapshot {snap_id} created in:\n{self.store.backup_dir}")
+
+        if self.store.dirty:
+            self.build_site(quiet=True)  # queued first, so the snapshot has the latest edits
+        store = self.store
+        self.tasks.submit("Backing up", lambda task: store.backup(progress=task.counter("Backing up file")), self._timing("backup", done))
 
     def restore_backup(self):
-        backup_path = filedialog.askdirectory(initialdir=BACKUP_DIR, title="Select Backup Folder")
-        if not backup_path: return
-        
-        if messagebox.askyesno("Restore", "This will OVERWRITE current data. Continue?"):
-            for f in Path(backup_path).glob("*"):
-                if f.is_file():
-                    shutil.copy(f, DATA_DIR)
+        snapshots = self.store.snapshots.list()
+
+        win = tk.Toplevel(self)
+        win.title("Restore Backup")
+        win.geometry("600x450")
+
+        ttk.Label(win, text="Snapshots (newest first):").pack(anchor="w", padx=5, pady=5)
+        snap_list = tk.Listbox(win, font=("Consolas", 10))
+        snap_list.pack(expand=True, fill="both", padx=5)
+        for snap_id, manifest in snapshots:
+            label = f" - {manifest['label']}" if manifest.get("label") else ""
+            snap_list.insert(tk.END, f"{snap_id}  ({len(manifest['files'])} files){label}")
+
+        def selected_snapshot():
+            sel = snap_list.curselection()
+            if not sel:
+                messagebox.showwarning("Restore", "Select a snapshot first.", parent=win)
+                return None
+            return snapshots[sel[0]][0]
+
+        store = self.store
+
+        def finish(result):
+            restored, removed = result
+            self.store.journal.clear()  # edits from before the restore no longer apply
             self.load_data()
-            messagebox.showinfo("Restore", "Data restored successfully!")
+            messagebox.showinfo("Restore", f"Data restored successfully!\n{len(restored)} file(s) restored, {len(removed)} removed.")
+
+        def run_restore(job):
+            # The restore works on its own store; the window reloads afterwards
+            win.destroy()
+            self._cancel_build()
+            self.tasks.submit("Restoring", job, finish)
+
+        def restore_all():
+            snap_id = selected_snapshot()
+            if not snap_id: return
+            if messagebox.askyesno("Restore", f"This will make data/ match snapshot {snap_id}. Continue?", parent=win):
+                run_restore(lambda task: store.detached().restore_snapshot(snap_id, progress=task.counter("Restoring file")))
+
+        def restore_level():
+            snap_id = selected_snapshot()
+            if not snap_id: return
+            level = simpledialog.askstring("Restore Level", "Level filename to restore:",
+                                           initialvalue=self._selected_filename() or "", parent=win)
+            if not level: return
+            run_restore(lambda task: store.detached().restore_snapshot(snap_id, level.strip()))
+
+        def restore_folder():
+            backup_path = filedialog.askdirectory(initialdir=self.store.backup_dir, title="Select Backup Folder", parent=win)
+            if not backup_path: return
+            if messagebox.askyesno("Restore", "This will OVERWRITE current data. Continue?", parent=win):
+                def job(task):
+                    store.detached().restore(backup_path)
+                    return [], []
+                run_restore(job)
+
+        def prune():
+            win.destroy()
+            self.tasks.submit("Pruning backups", lambda task: self.store.snapshots.prune(),
+                              lambda result: messagebox.showinfo("Backups", f"Removed {result[0]} old snapshot(s) and {result[1]} unused file(s)."))
+
+        btns = ttk.Frame(win)
+        btns.pack(fill="x", padx=5, pady=5)
+        ttk.Button(btns, text="Restore Snapshot", command=restore_all).pack(side="left", padx=2)
+        ttk.Button(btns, text="Restore One Level...", command=restore_level).pack(side="left", padx=2)
+        ttk.Button(btns, text="Old Backup Folder...", command=restore_folder).pack(side="left", padx=2)
+        ttk.Button(btns, text="Prune Old Snapshots", command=prune).pack(side="right", padx=2)
+
+    def build_site(self, quiet=False):
+        # Journaled edits are written first, so the site files include them
+        self._cancel_build()
+        if not self.loaded:
+            return  # edits stay in the journal until the data is loaded
+        store = self.store.unsaved()
+        order = list(store.level_files)
+        journal = self.store.journal
+
+        def job(task):
+            wrote_order = store.flush()
+            task.progress("Building site files")
+            return wrote_order, store.build()
+
+        def done(result):
+            wrote_order, errors = result
+            self.store.saved(store)
+            if wrote_order:
+                self._saved_order = order
+            if journal.lines >= JOURNAL_COMPACT_LINES:
+                self.tasks.submit("Compacting journal", lambda task: journal.compact())
+            self.set_status(f"Site files built - Total Levels: {len(store.level_files)}")
+            if quiet:
+                return
+            if errors:
+                messagebox.showwarning("Build", "Bundle built, but these levels failed to load:\n" + "\n".join(errors))
+            else:
+                messagebox.showinfo("Build", f"Bundle built with {len(store.level_files)} levels.")
+
+        self.tasks.submit("Building site files", job, done)
+
+    def import_records(self):
+        path = filedialog.askopenfilename(title="Select Submissions File",
+                                          filetypes=[("Submissions", "*.jsonl *.csv"), ("All files", "*.*")])
+        if not path: return
+        if self.store.dirty:
+            self.build_site(quiet=True)  # the import re-reads data/ after this is written
+        store = self.store.detached()
+
+        def job(task):
+            store.load()
+            report = import_records(store, path)
+            if report["accepted"]:
+                store.flush()
+                store.build()
+            return report
+
+        def done(report):
+            if report["accepted"] and self.store.journal is not None:
+                self.store.journal.forget()  # the import is not journaled, so older edits cannot be undone over it
+            for fname in report["levels"]:
+                self.search_index.update(fname, self.store.level(fname))
+                self.player_index.update(fname, self.store.level(fname))
+            self.refresh_levels_list()
+            messagebox.showinfo("Import", format_import_report(report))
+
+        self.tasks.submit("Importing records", job, done,
+                          lambda e: messagebox.showerror("Import", f"Could not read file:\n{e}"))
 
     def deploy_to_github(self):
-        self.save_everything()
-        repo_url = self.settings_data.get("github_url", "").strip()
+        if not self.save_everything(quiet=True):
+            return
+        repo_url = self.store.settings_data.get("github_url", "").strip()
         
         if not repo_url:
             messagebox.showerror("Error", "Please enter a GitHub Repository URL in Settings first.")
             return
 
-        def run_git():
-            try:
-                # 1. Check Git
-                subprocess.run(["git", "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                messagebox.showerror("Error", "Git is not installed or not found in PATH.")
-                return
+        repo_dir = self.store.data_dir.parent
+        data_dir = self.store.data_dir
+        store = self.store.detached()
 
-            try:
-                # 2. Smart Deploy
-                commands = []
-                
-                # Check if already initialized
-                is_initialized = (DATA_DIR.parent / ".git").exists()
-                
-                if not is_initialized:
-                    commands.append(["git", "init"])
-                    commands.append(["git", "branch", "-M", "main"])
-
-                # Check remote
-                current_remote = ""
-                if is_initialized:
-                    try:
-                        res = subprocess.run(["git", "remote", "get-url", "origin"], stdout=subprocess.PIPE, text=True)
-                        current_remote = res.stdout.strip()
-                    except:
-                        pass
-                
-                if current_remote != repo_url:
-                    if current_remote:
-                        commands.append(["git", "remote", "remove", "origin"])
-                    commands.append(["git", "remote", "add", "origin", repo_url])
-
-                # Standard update flow
-                commands.append(["git", "add", "."])
-                commands.append(["git", "commit", "-m", f"Update site data {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"])
-                commands.append(["git", "push", "-f", "-u", "origin", "main"])
-                
-                log = ""
-                for cmd in commands:
-                    # Run command
-                    try:
-                        if cmd[0] == "git" and cmd[1] == "push":
-                             # Push might take time, let's treat it carefully, maybe capture output better
-                             pass
-
-                        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                        log += f"> {' '.join(cmd)}\n"
-                        if result.returncode != 0:
-                            # Ignore "nothing to commit"
-                            if "nothing to commit" in result.stdout or "nothing to commit" in result.stderr:
-                                log += "  (Nothing to commit)\n"
-                            elif "remote origin already exists" in result.stderr:
-                                pass
-                            else:
-                                log += f"{result.stderr}\n"
-                    except Exception as ex:
-                        log += f"Error running {cmd}: {ex}\n"
-
-                messagebox.showinfo("Deploy Result", f"Update Process Finished.\n\nLog:\n{log}")
-                
-            except Exception as e:
-                messagebox.showerror("Deploy Error",str(e))
+        def checked(problems):
+            if problems:
+                shown = "\n".join(problems[:15]) + (f"\n... and {len(problems) - 15} more" if len(problems) > 15 else "")
+                if not messagebox.askyesno("Validation", f"{len(problems)} problem(s) found:\n\n{shown}\n\nDeploy anyway?"):
+                    self.set_status(f"Deploy cancelled: {len(problems)} validation problem(s)")
+                    return
+            # The check was queued behind the save's build, so the pushed files are up to date
+            self.tasks.submit("Deploying", run_git, finished, lambda e: messagebox.showerror("Deploy Error", str(e)))
+
+        def run_git(task):
+            started = time.perf_counter()
+            log, pushed = deploy_site(repo_dir, repo_url, data_dir, progress=task.progress)
+            return log, pushed, time.perf_counter() - started
+
+        def done(result):
+            log, pushed, seconds = result
+            self.set_status(f"Deploy finished in {seconds:.1f}s" if pushed else "Deploy: nothing changed")
+            messagebox.showinfo("Deploy Result", f"Update Process Finished.\n\nLog:\n" + "\n".join(log))
+
+        finished = self._timing("deploy", done)
 
-        threading.Thread(target=run_git).start()
+        self.tasks.submit("Validating", lambda task: store.validate(task.progress), checked)
+
+    def save_everything(self, quiet=False):
+        # Collect everything from the tabs here; the files are written and
+        # the site rebuilt in the background. Unchanged files are skipped.
+        # Tabs that were never opened have nothing new in them.
+        if not self.loaded:
+            messagebox.showwarning("Save", "The data is not loaded, so there is nothing to save yet.\n"
+                                   "If loading failed or was cancelled, use File -> Reload Data.")
+            return False
 
-    def save_everything(self):
         # 1. Save Settings
-        self.settings_data["title"] = self.ent_title.get()
-        self.settings_data["list_name_header"] = self.ent_header.get()
-        self.settings_data["telegram_link"] = self.ent_telegram.get()
-        self.settings_data["submit_link"] = self.ent_submit.get()
-        self.settings_data["github_url"] = self.ent_github.get()
-        
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(self.settings_data, f, indent=4)
+        if "settings" in self.built_tabs:
+            self.store.settings_data["title"] = self.ent_title.get()
+            self.store.settings_data["list_name_header"] = self.ent_header.get()
+            self.store.settings_data["telegram_link"] = self.ent_telegram.get()
+            self.store.settings_data["submit_link"] = self.ent_submit.get()
+            self.store.settings_data["github_url"] = self.ent_github.get()
 
-        # 2. Save List Order
-        with open(LIST_FILE, "w") as f:
-            json.dump(self.level_files, f, indent=4)
+        # 2. Save List Order (already in self.store.level_files)
         
         # 3. Save Editors
-        try:
-            editors_text = self.editors_text.get("1.0", tk.END).strip()
-            self.editors_data = json.loads(editors_text)
-            with open(EDITORS_FILE, "w") as f:
-                json.dump(self.editors_data, f, indent=4)
-        except Exception as e:
-            messagebox.showerror("Error Saving Editors", f"Invalid JSON in Editors tab:\n{e}")
-            return
+        if "editors" in self.built_tabs:
+            try:
+                editors_text = self.editors_text.get("1.0", tk.END).strip()
+                self.store.editors_data = json.loads(editors_text)
+            except ValueError as e:
+                messagebox.showerror("Error Saving Editors", f"Invalid JSON in Editors tab:\n{e}")
+                return False
 
         # 4. Save Requirements
-        reqs_text = self.reqs_text.get("1.0", tk.END).strip()
-        self.reqs_data = [line for line in reqs_text.split('\n') if line.strip()]
-        with open(REQS_FILE, "w") as f:
-            json.dump(self.reqs_data, f, indent=4)
+        if "reqs" in self.built_tabs:
+            reqs_text = self.reqs_text.get("1.0", tk.END).strip()
+            self.store.reqs_data = [line for line in reqs_text.split('\n') if line.strip()]
 
-        messagebox.showinfo("Success", "All settings SAVED! Check the website (Refresh F5).")
+        # 5. Write, then rebuild the bundle, leaderboard and manifest the site loads
+        self._cancel_build()
+        store = self.store.unsaved()
+        order = list(store.level_files)
 
-    # --- 1. Settings Tab ---
-    def init_settings_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Site Settings")
+        def job(task):
+            store.flush()
+            written = store.save()
+            task.progress("Building site files")
+            store.build()
+            return written
+
+        def done(written):
+            self.store.saved(store)
+            self._saved_order = order
+            self.set_status(f"Saved ({len(written)} list file(s) changed) - Total Levels: {len(store.level_files)}")
+            if not quiet:
+                messagebox.showinfo("Success", "All settings SAVED! Check the website (Refresh F5).")
 
+        self.tasks.submit("Saving", job, self._timing("save_everything", done))
+        return True
+
+    # --- 1. Settings Tab ---
+    def init_settings_tab(self, frame):
+        self.built_tabs.add("settings")
         ttk.Label(frame, text="Global Website Settings", font=("Arial", 16, "bold")).pack(pady=10)
         
         form = ttk.Frame(frame)
@@ -245,159 +3246,189 @@ class ListManager(tk.Tk):
 
         btn_frame = ttk.Frame(frame)
         btn_frame.pack(pady=20)
-        ttk.Button(btn_frame, text="SAVE ALL GLOBAL SETTINGS", command=self.save_everything).pack(side="left", padx=10)
-        ttk.Button(btn_frame, text="SAVE & DEPLOY TO GITHUB", command=self.deploy_to_github).pack(side="left", padx=10)
+        self._data_button(btn_frame, "SAVE ALL GLOBAL SETTINGS", self.save_everything).pack(side="left", padx=10)
+        self._data_button(btn_frame, "SAVE & DEPLOY TO GITHUB", self.deploy_to_github).pack(side="left", padx=10)
+        self.refresh_settings_ui()
 
     def refresh_settings_ui(self):
+        if "settings" not in self.built_tabs:
+            return
         self.ent_title.delete(0, tk.END)
-        self.ent_title.insert(0, self.settings_data.get("title", ""))
+        self.ent_title.insert(0, self.store.settings_data.get("title", ""))
         
         self.ent_header.delete(0, tk.END)
-        self.ent_header.insert(0, self.settings_data.get("list_name_header", ""))
+        self.ent_header.insert(0, self.store.settings_data.get("list_name_header", ""))
         
         self.ent_telegram.delete(0, tk.END)
-        self.ent_telegram.insert(0, self.settings_data.get("telegram_link", ""))
+        self.ent_telegram.insert(0, self.store.settings_data.get("telegram_link", ""))
         
         self.ent_submit.delete(0, tk.END)
-        self.ent_submit.insert(0, self.settings_data.get("submit_link", ""))
+        self.ent_submit.insert(0, self.store.settings_data.get("submit_link", ""))
 
         self.ent_github.delete(0, tk.END)
-        self.ent_github.insert(0, self.settings_data.get("github_url", ""))
+        self.ent_github.insert(0, self.store.settings_data.get("github_url", ""))
 
-        c = self.settings_data.get("primary_color", "#0066ff")
+        c = self.store.settings_data.get("primary_color", "#0066ff")
         self.btn_color.config(bg=c, text=c)
 
     def pick_color(self):
         color = colorchooser.askcolor(title="Choose Primary Color")
         if color[1]:
-            self.settings_data["primary_color"] = color[1]
+            self.store.settings_data["primary_color"] = color[1]
             self.btn_color.config(bg=color[1], text=color[1])
 
     # --- 2. Levels Tab ---
-    def init_levels_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Levels")
-
+    def init_levels_tab(self, frame):
+        self.built_tabs.add("levels")
         # Toolbar
         toolbar = ttk.Frame(frame)
         toolbar.pack(fill="x", padx=5, pady=5)
         
-        ttk.Button(toolbar, text="Add Level", command=self.add_level).pack(side="left", padx=2)
-        ttk.Button(toolbar, text="Edit Level Details", command=self.edit_level).pack(side="left", padx=2)
-        ttk.Button(toolbar, text="Delete Level", command=self.delete_level).pack(side="left", padx=2)
+        self._data_button(toolbar, "Add Level", self.add_level).pack(side="left", padx=2)
+        self._data_button(toolbar, "Edit Level Details", self.edit_level).pack(side="left", padx=2)
+        self._data_button(toolbar, "Delete Level", self.delete_level).pack(side="left", padx=2)
         ttk.Separator(toolbar, orient="vertical").pack(side="left", fill="y", padx=5)
-        ttk.Button(toolbar, text="Move Up", command=lambda: self.move_level(-1)).pack(side="left", padx=2)
-        ttk.Button(toolbar, text="Move Down", command=lambda: self.move_level(1)).pack(side="left", padx=2)
+        self._data_button(toolbar, "Move Up", lambda: self.move_level(-1)).pack(side="left", padx=2)
+        self._data_button(toolbar, "Move Down", lambda: self.move_level(1)).pack(side="left", padx=2)
+        self._data_button(toolbar, "Move to Rank...", self.move_to_rank).pack(side="left", padx=2)
         
-        ttk.Button(toolbar, text="SAVE LIST ORDER", command=self.save_everything).pack(side="right", padx=5)
+        self._data_button(toolbar, "SAVE LIST ORDER", self.save_everything).pack(side="right", padx=5)
 
         # Search
         search_frame = ttk.Frame(frame)
         search_frame.pack(fill="x", padx=5)
         ttk.Label(search_frame, text="Search:").pack(side="left")
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self.filter_levels)
+        self.search_var.trace("w", self._schedule_filter)
         ttk.Entry(search_frame, textvariable=self.search_var).pack(side="left", fill="x", expand=True, padx=5)
 
-        # Listbox
-        self.levels_listbox = tk.Listbox(frame, selectmode=tk.SINGLE, font=("Consolas", 10))
+        # Listbox: Ctrl/Shift select several levels, drag a selection to move it
+        self.levels_listbox = tk.Listbox(frame, selectmode=tk.EXTENDED, font=("Consolas", 10))
         self.levels_listbox.pack(expand=True, fill="both", padx=5, pady=5)
         self.levels_listbox.bind("<Double-Button-1>", lambda e: self.edit_level())
-        
-        # Status Bar
-        self.status = ttk.Label(frame, text="Ready", relief=tk.SUNKEN, anchor="w")
-        self.status.pack(fill="x")
+        self.levels_listbox.bind("<ButtonPress-1>", self._drag_start)
+        self.levels_listbox.bind("<B1-Motion>", self._drag_motion)
+        self.levels_listbox.bind("<ButtonRelease-1>", self._drag_end)
+        self.refresh_levels_list()
+
+    def _schedule_filter(self, *args):
+        # Debounce: only filter once typing pauses
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(SEARCH_DEBOUNCE_MS, self.filter_levels)
+
+    def _cancel_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
 
     def filter_levels(self, *args):
-        query = self.search_var.get().lower()
+        self._filter_job = None
+        with self.perf.measure("filter_levels"):
+            hits = self.search_index.search(self.search_var.get(), self.store.level_files)
+            ready = self._ready_rows()
+            if ready < len(self.store.level_files):
+                hits = [i for i in hits if i < ready]  # the rest are searched once loaded
+            self._show_rows(hits)
+
+    def _show_rows(self, rows):
+        self.visible_rows = rows
         self.levels_listbox.delete(0, tk.END)
-        for i, fname in enumerate(self.level_files):
-            if query in fname.lower():
-                display = self._get_level_display(i, fname)
-                self.levels_listbox.insert(tk.END, display)
-            else:
-                # Also check name in file
-                try:
-                    with open(DATA_DIR / f"{fname}.json", "r") as f:
-                        data = json.load(f)
-                        if query in data.get("name", "").lower():
-                            display = self._get_level_display(i, fname)
-                            self.levels_listbox.insert(tk.END, display)
-                except:
-                    pass
+        if rows:
+            self.levels_listbox.insert(tk.END, *[self._get_level_display(i, self.store.level_files[i]) for i in rows])
+
+    def _selected_filename(self):
+        sel = self.levels_listbox.curselection()
+        if not sel or sel[0] >= len(self.visible_rows):
+            return None
+        return self.store.level_files[self.visible_rows[sel[0]]]
 
     def _get_level_display(self, i, fname):
-        try:
-            with open(DATA_DIR / f"{fname}.json", "r") as f:
-                data = json.load(f)
-                name = data.get('name', 'Unknown')
-                return f"#{i+1} - {name} ({fname})"
-        except:
-            return f"#{i+1} - {fname} (Error loading JSON)"
+        return level_display(i, fname, self.store.level(fname))
+
+    def _selected_rows(self):
+        # Positions in level_files of the selected rows, in list order
+        return [self.visible_rows[row] for row in self.levels_listbox.curselection() if row < len(self.visible_rows)]
+
+    def _select_levels(self, fnames):
+        wanted = set(fnames)
+        listbox = self.levels_listbox
+        listbox.selection_clear(0, tk.END)
+        rows = [row for row, i in enumerate(self.visible_rows) if self.store.level_files[i] in wanted]
+        for row in rows:
+            listbox.selection_set(row)
+        if rows:
+            listbox.activate(rows[0])
+            listbox.see(rows[0])
+
+    def _redraw_rows(self, first, last=None):
+        """Redraw the rows of positions `first`..`last` (default: to the end) after the order changed."""
+        self.search_index.invalidate()
+        if "levels" not in self.built_tabs:
+            return
+        if self.search_var.get():
+            self.filter_levels()  # ranks and matches may have moved
+            return
+        files = self.store.level_files
+        listbox = self.levels_listbox
+        with self.perf.measure("redraw_rows"):
+            if last is None or listbox.size() != len(files):
+                last = self._ready_rows() - 1  # rows still loading are added by _load_levels_step
+                listbox.delete(first, tk.END)
+                self.visible_rows = list(range(last + 1))
+            else:
+                listbox.delete(first, last)
+            if first <= last:
+                listbox.insert(first, *[self._get_level_display(i, files[i]) for i in range(first, last + 1)])
 
     def refresh_levels_list(self):
+        if "levels" not in self.built_tabs:
+            return
         self.search_var.set("") # Clear filter to show all
-        self.levels_listbox.delete(0, tk.END)
-        for i, fname in enumerate(self.level_files):
-            display = self._get_level_display(i, fname)
-            self.levels_listbox.insert(tk.END, display)
-        self.status.config(text=f"Total Levels: {len(self.level_files)}")
+        self._cancel_filter()
+        with self.perf.measure("refresh_levels_list"):
+            self.search_index.invalidate()
+            self._show_rows(list(range(self._ready_rows())))
+        if self._loading is None:
+            self.status.config(text=f"Total Levels: {len(self.store.level_files)}")
 
     def add_level(self):
         filename = simpledialog.askstring("New Level", "Enter filename (e.g. MyLevel):")
         if not filename: return
         filename = filename.strip()
-        if filename in self.level_files:
-            messagebox.showerror("Error", "Level filename already exists!")
+        try:
+            default_data = self.store.add_level(filename)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
             return
+        self.search_index.update(filename, default_data)
+        self.player_index.update(filename, default_data)
         
-        # Create default data
-        default_data = {
-            "id": 0,
-            "name": filename,
-            "author": "Author",
-            "creators": [],
-            "verifier": "Verifier",
-            "verification": "https://youtu.be/example",
-            "percentToQualify": 100,
-            "password": "Free to Copy",
-            "records": []
-        }
-        
-        with open(DATA_DIR / f"{filename}.json", "w") as f:
-            json.dump(default_data, f, indent=4)
-        
-        self.level_files.append(filename)
         self.refresh_levels_list()
-        self.save_everything() 
+        self._schedule_build()
         self.edit_level_dialog(filename)
 
     def edit_level(self):
-        sel = self.levels_listbox.curselection()
-        if not sel: return
-        # Handle Move/Edit when filtered
-        # Simple approach: get the filename from the text string
-        item_text = self.levels_listbox.get(sel[0])
-        # Format: #1 - Name (Filename)
-        # Extract Filename from parens at end
-        filename = item_text.split("(")[-1].replace(")", "")
+        # Rows map back to level_files, so this also works while filtered
+        if not self._check_loaded(): return
+        filename = self._selected_filename()
+        if not filename: return
         self.edit_level_dialog(filename)
 
     def delete_level(self):
-        sel = self.levels_listbox.curselection()
-        if not sel: return
-        item_text = self.levels_listbox.get(sel[0])
-        filename = item_text.split("(")[-1].replace(")", "")
+        filename = self._selected_filename()
+        if not filename: return
         
-        if messagebox.askyesno("Confirm", f"Delete {filename}? This will remove the JSON file."):
+        if messagebox.askyesno("Confirm", f"Delete {filename}? This will remove the JSON file (Ctrl+Z undoes it)."):
             try:
-                os.remove(DATA_DIR / f"{filename}.json")
-            except OSError:
-                pass
-            if filename in self.level_files:
-                self.level_files.remove(filename)
+                self.store.delete_level(filename)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not write the journal:\n{e}")
+                return
+            self.search_index.remove(filename)
+            self.player_index.remove(filename)
             self.refresh_levels_list()
-            self.save_everything() 
+            self._schedule_build()
 
     def move_level(self, direction):
         # Only allowed if NOT filtering
@@ -405,28 +3436,112 @@ class ListManager(tk.Tk):
             messagebox.showwarning("Warning", "Cannot move levels while searching. Clear search first.")
             return
 
-        sel = self.levels_listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        new_idx = idx + direction
-        if 0 <= new_idx < len(self.level_files):
-            self.level_files[idx], self.level_files[new_idx] = self.level_files[new_idx], self.level_files[idx]
-            self.refresh_levels_list()
-            self.levels_listbox.selection_set(new_idx)
+        rows = self._selected_rows()
+        if not rows: return
+        # The selection moves as one block
+        if 0 <= rows[0] + direction and rows[-1] + direction < len(self.store.level_files):
+            self._move_selected(rows[0] + direction + 1)
 
-    def edit_level_dialog(self, filename):
-        file_path = DATA_DIR / f"{filename}.json"
-        
+    def move_to_rank(self):
+        # Also works while searching: find a level, then send it to its rank
+        rows = self._selected_rows()
+        if not rows: return
+        total = len(self.store.level_files)
+        rank = simpledialog.askinteger("Move to Rank", f"Move {len(rows)} level(s) to rank (1-{total}):",
+                                       minvalue=1, maxvalue=total, parent=self)
+        if rank is None: return
+        self._move_selected(rank)
+
+    def _move_selected(self, rank):
+        if not self._check_loaded(): return
+        fnames = [self.store.level_files[i] for i in self._selected_rows()]
+        if not fnames: return
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
-        except:
+            changed = self.store.move_levels(fnames, rank)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if changed is None: return
+        self._redraw_rows(*changed)
+        self._select_levels(fnames)
+        self._schedule_build()
+        rank = self.store.level_files.index(fnames[0]) + 1  # after clamping
+        self.set_status(f"Moved {len(fnames)} level(s) to #{rank} - Total Levels: {len(self.store.level_files)}")
+
+    def import_order(self):
+        path = filedialog.askopenfilename(title="Select Order File",
+                                          filetypes=[("Order", "*.txt *.json"), ("All files", "*.*")])
+        if not path: return
+        try:
+            changed = self.store.reorder_levels(read_order_file(path))
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Import Order", str(e))
+            return
+        if changed is None:
+            messagebox.showinfo("Import Order", "The list is already in that order.")
+            return
+        self._redraw_rows(*changed)
+        self._schedule_build()
+        self.set_status(f"Order imported: #{changed[0] + 1} to #{changed[1] + 1} changed (Ctrl+Z undoes it)")
+
+    # Dragging: pressing on a selected row starts a drag instead of a new selection
+    def _drag_start(self, event):
+        listbox = self.levels_listbox
+        row = listbox.nearest(event.y)
+        if self.search_var.get() or event.state & 0x0005 or row not in listbox.curselection():
+            self._drag = None  # Shift/Ctrl or an unselected row: normal selection
+            return None
+        self._drag = [row, row]
+        return "break"  # keep the selection
+
+    def _drag_motion(self, event):
+        if self._drag is None:
+            return None
+        listbox = self.levels_listbox
+        if event.y < 0:
+            listbox.yview_scroll(-1, "units")
+        elif event.y > listbox.winfo_height():
+            listbox.yview_scroll(1, "units")
+        row = listbox.nearest(event.y)
+        if row != self._drag[1]:
+            listbox.itemconfig(self._drag[1], background="")
+            self._drag[1] = row
+            if row != self._drag[0]:
+                listbox.itemconfig(row, background="#cce0ff")
+            self.set_status(f"Drop to move {len(listbox.curselection())} level(s) to #{row + 1}")
+        return "break"
+
+    def _drag_end(self, event):
+        if self._drag is None:
+            return None
+        pressed, row = self._drag
+        self._drag = None
+        listbox = self.levels_listbox
+        listbox.itemconfig(row, background="")
+        if row == pressed:
+            # A click without a drag selects just that row, as it normally would
+            listbox.selection_clear(0, tk.END)
+            listbox.selection_set(row)
+            listbox.activate(row)
+            return "break"
+        self._move_selected(row + 1)
+        return "break"
+
+    def edit_level_dialog(self, filename):
+        started = time.perf_counter()
+        data = self.store.level(filename)
+        if data is None:
             messagebox.showerror("Error", "Could not load level file")
             return
+        # Work on a copy so a cancelled or invalid edit never leaks into the cache
+        data = copy.deepcopy(data)
 
         win = tk.Toplevel(self)
         win.title(f"Editing {filename}")
         win.geometry("800x800")
+        opened = file_stamp(self.store.levels.path(filename))
+        self._open_editors[filename] = win
+        win.bind("<Destroy>", lambda e: e.widget is win and self._open_editors.pop(filename, None))
 
         # Tabs in Editor
         nb = ttk.Notebook(win)
@@ -468,23 +3583,18 @@ class ListManager(tk.Tk):
         
         rec_toolbar = ttk.Frame(tab_records)
         rec_toolbar.pack(fill="x")
-        
-        rec_list_frame = ttk.Frame(tab_records)
-        rec_list_frame.pack(fill="both", expand=True)
-        
-        records_list = tk.Listbox(rec_list_frame, font=("Consolas", 10))
-        records_list.pack(side="left", fill="both", expand=True)
-        
-        sb = ttk.Scrollbar(rec_list_frame, orient="vertical", command=records_list.yview)
-        sb.pack(side="right", fill="y")
-        records_list.config(yscrollcommand=sb.set)
 
-        current_records = data.get("records", [])
+        records = LevelRecords(data.get("records", []))
+        table = RecordTable(tab_records, records)
+        table.pack(fill="both", expand=True)
+
+        rec_count = ttk.Label(tab_records)
+        rec_count.pack(anchor="w", padx=5)
 
         def refresh_records_ui():
-            records_list.delete(0, tk.END)
-            for i, rec in enumerate(current_records):
-                records_list.insert(tk.END, f"{i+1}. {rec['user']} | {rec['percent']}% | {rec['hz']}Hz | {rec.get('link','')}")
+            table.refresh()
+            dups = records.duplicate_users()
+            rec_count.config(text=f"{len(records.records)} records" + (f", {dups} users with more than one (red)" if dups else ""))
 
         refresh_records_ui()
 
@@ -515,29 +3625,103 @@ class ListManager(tk.Tk):
             
             def save_rec():
                 try:
-                    current_records.append({
+                    record = {
                         "user": e_user.get(),
                         "link": e_link.get(),
                         "percent": int(e_pct.get()),
                         "hz": int(e_hz.get()),
                         "mobile": False 
-                    })
-                    refresh_records_ui()
-                    d.destroy()
+                    }
                 except ValueError:
-                    messagebox.showerror("Error", "Percent and Hz must be numbers")
+                    messagebox.showerror("Error", "Percent and Hz must be numbers", parent=d)
+                    return
+                existing = records.records_of(record["user"])
+                if existing:
+                    best = max(records.records[i].get("percent", 0) for i in existing)
+                    if not messagebox.askyesno("Duplicate", f"{record['user']} already has {len(existing)} record(s) here (best {best}%). Add anyway?", parent=d):
+                        return
+                records.add([record])
+                refresh_records_ui()
+                d.destroy()
 
             ttk.Button(f, text="Add", command=save_rec).grid(row=4, columnspan=2, pady=10)
 
+        def paste_records():
+            d = tk.Toplevel(win)
+            d.title("Paste Records")
+            d.geometry("600x400")
+            ttk.Label(d, text="One record per line: user, percent, hz, link, mobile (hz and the rest are optional).\n"
+                              "Rows copied from a spreadsheet (tab-separated) work too.").pack(anchor="w", padx=5, pady=5)
+            text = tk.Text(d, font=("Consolas", 10))
+            text.pack(fill="both", expand=True, padx=5)
+            skip_dups = tk.BooleanVar(value=True)
+            ttk.Checkbutton(d, text="Skip users who already have a record on this level", variable=skip_dups).pack(anchor="w", padx=5)
+
+            def add_pasted():
+                parsed, errors = parse_record_lines(text.get("1.0", tk.END))
+                if errors:
+                    more = f"\n... and {len(errors) - 10} more" if len(errors) > 10 else ""
+                    messagebox.showerror("Paste Records", "Nothing added, fix these lines first:\n" + "\n".join(errors[:10]) + more, parent=d)
+                    return
+                skipped = records.add(parsed, skip_duplicates=skip_dups.get())
+                refresh_records_ui()
+                d.destroy()
+                msg = f"Added {len(parsed) - len(skipped)} record(s)."
+                if skipped:
+                    msg += f"\nSkipped {len(skipped)} duplicate user(s): {', '.join(skipped[:20])}"
+                messagebox.showinfo("Paste Records", msg, parent=win)
+
+            ttk.Button(d, text="Add Records", command=add_pasted).pack(pady=5)
+
+        def selected_records():
+            if not table.selected:
+                messagebox.showwarning("Records", "Select one or more records first.", parent=win)
+            return sorted(table.selected)
+
+        def edit_records():
+            positions = selected_records()
+            if not positions: return
+            d = tk.Toplevel(win)
+            d.title(f"Edit {len(positions)} Record(s)")
+            f = ttk.Frame(d, padding=10)
+            f.pack()
+            ttk.Label(f, text="Field:").grid(row=0, column=0)
+            field = ttk.Combobox(f, values=["hz", "percent", "mobile", "link", "user"], state="readonly")
+            field.current(0)
+            field.grid(row=0, column=1)
+            ttk.Label(f, text="New value:").grid(row=1, column=0)
+            e_value = ttk.Entry(f)
+            e_value.grid(row=1, column=1)
+
+            def apply_edit():
+                key, value = field.get(), e_value.get().strip()
+                if key in ("hz", "percent"):
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        messagebox.showerror("Error", "Percent and Hz must be numbers", parent=d)
+                        return
+                elif key == "mobile":
+                    value = _parse_flag(value)
+                records.edit(positions, key, value)
+                refresh_records_ui()
+                d.destroy()
+
+            ttk.Button(f, text="Apply", command=apply_edit).grid(row=2, columnspan=2, pady=10)
+
         def delete_record():
-            sel = records_list.curselection()
-            if not sel: return
-            if messagebox.askyesno("Delete", "Delete selected record?"):
-                current_records.pop(sel[0])
+            positions = selected_records()
+            if not positions: return
+            if messagebox.askyesno("Delete", f"Delete {len(positions)} selected record(s)?", parent=win):
+                records.delete(positions)
+                table.selected.clear()
                 refresh_records_ui()
 
         ttk.Button(rec_toolbar, text="Add Record", command=add_record).pack(side="left", padx=5)
+        ttk.Button(rec_toolbar, text="Paste Records...", command=paste_records).pack(side="left", padx=5)
+        ttk.Button(rec_toolbar, text="Edit Selected...", command=edit_records).pack(side="left", padx=5)
         ttk.Button(rec_toolbar, text="Delete Selected", command=delete_record).pack(side="left", padx=5)
+        ttk.Button(rec_toolbar, text="Select All", command=table.select_all).pack(side="left", padx=5)
 
         def save_level():
             # Update data dict
@@ -558,45 +3742,450 @@ class ListManager(tk.Tk):
             creators_str = entries["_creators"].get()
             data["creators"] = [c.strip() for c in creators_str.split(",") if c.strip()]
             
-            data["records"] = current_records
-            
-            # Write to file
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=4)
-            
-            # Refresh main list
-            self.refresh_levels_list()
+            data["records"] = records.records
+
+            # Our own background writes of earlier edits do not count
+            if file_stamp(self.store.levels.path(filename)) != opened and not self.store.levels.wrote(filename):
+                if not messagebox.askyesno("Changed on Disk", f"{filename}.json was changed outside the manager after you opened it.\n\n"
+                                           "Overwrite it with your version?", parent=win):
+                    return
+
+            if not self._check_loaded():
+                messagebox.showwarning("Save", "The list is being reloaded; save again once it is loaded.", parent=win)
+                return
+
+            # Journal the edit; the file is written in the background
+            with self.perf.measure("edit_dialog_save"):
+                try:
+                    self.store.edit_level(filename, data)
+                except OSError as e:
+                    messagebox.showerror("Error", f"Could not write the journal:\n{e}", parent=win)
+                    return
+                self.search_index.update(filename, data)
+                self.player_index.update(filename, data)
+                self._schedule_build()
+
+                # Refresh main list
+                self.refresh_levels_list()
             messagebox.showinfo("Saved", f"Level '{filename}' saved successfully.")
             win.destroy()
 
         ttk.Button(win, text="SAVE THIS LEVEL", command=save_level).pack(pady=10, fill="x", padx=10)
+        win.update_idletasks()
+        self.perf.record("edit_dialog_open", time.perf_counter() - started)
 
     # --- 3. Editors Tab ---
-    def init_editors_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Editors")
-        
+    def init_editors_tab(self, frame):
+        self.built_tabs.add("editors")
         ttk.Label(frame, text="Edit Editors JSON directly (Advanced):").pack(anchor="w", padx=5, pady=5)
         self.editors_text = tk.Text(frame)
         self.editors_text.pack(expand=True, fill="both", padx=5, pady=5)
-        
+        self.refresh_editors_ui()
+
     def refresh_editors_ui(self):
+        if "editors" not in self.built_tabs:
+            return
         self.editors_text.delete("1.0", tk.END)
-        self.editors_text.insert("1.0", json.dumps(self.editors_data, indent=4))
+        self.editors_text.insert("1.0", json.dumps(self.store.editors_data, indent=4))
 
     # --- 4. Requirements Tab ---
-    def init_reqs_tab(self):
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="Requirements")
-        
+    def init_reqs_tab(self, frame):
+        self.built_tabs.add("reqs")
         ttk.Label(frame, text="Edit Requirements (One per line):").pack(anchor="w", padx=5, pady=5)
         self.reqs_text = tk.Text(frame)
         self.reqs_text.pack(expand=True, fill="both", padx=5, pady=5)
+        self.refresh_reqs_ui()
 
     def refresh_reqs_ui(self):
+        if "reqs" not in self.built_tabs:
+            return
         self.reqs_text.delete("1.0", tk.END)
-        self.reqs_text.insert("1.0", "\n".join(self.reqs_data))
+        self.reqs_text.insert("1.0", "\n".join(self.store.reqs_data))
+
+    # --- 5. Players Tab ---
+    def init_players_tab(self, frame):
+        self.built_tabs.add("players")
+        self.players_frame = frame
+
+        left = ttk.Frame(frame)
+        left.pack(side="left", fill="y", padx=5, pady=5)
+        self.player_filter = tk.StringVar()
+        self.player_filter.trace_add("write", lambda *args: self.refresh_players_ui())
+        ttk.Entry(left, textvariable=self.player_filter).pack(fill="x")
+        self.players_listbox = tk.Listbox(left, width=35, font=("Consolas", 10), exportselection=False)
+        self.players_listbox.pack(fill="y", expand=True)
+        self.players_listbox.bind("<<ListboxSelect>>", lambda e: self.show_player())
+        self.player_names = []  # listbox row -> player name
+
+        right = ttk.Frame(frame)
+        right.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self._data_button(right, "Rename / Merge Player...", self.rename_player).pack(anchor="w")
+        self.player_entries = tk.Listbox(right, font=("Consolas", 10))
+        self.player_entries.pack(fill="both", expand=True, pady=5)
+
+        # Only rebuilt while the tab is shown
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.refresh_players_ui(), add="+")
+        self.refresh_players_ui()
+
+    def refresh_players_ui(self):
+        if "players" not in self.built_tabs or self.notebook.select() != str(self.players_frame):
+            return
+        query = self.player_filter.get().strip().lower()
+        players = [p for p in self.player_index.players() if query in p[0].lower()]
+        self.player_names = [name for name, _ in players]
+        self.players_listbox.delete(0, tk.END)
+        self.players_listbox.insert(tk.END, *[f"{name} ({count})" for name, count in players])
+        self.player_entries.delete(0, tk.END)
+
+    def _selected_player(self):
+        sel = self.players_listbox.curselection()
+        return self.player_names[sel[0]] if sel else None
+
+    def show_player(self):
+        name = self._selected_player()
+        if not name: return
+        self.player_entries.delete(0, tk.END)
+        for rank, fname, index, role in self.player_index.entries(name, self.store.level_files):
+            data = self.store.level(fname) or {}
+            where = f"#{rank}" if rank else "unlisted"
+            if role == "verifier":
+                self.player_entries.insert(tk.END, f"{where} {data.get('name', fname)} - verifier")
+            else:
+                record = data["records"][index]
+                self.player_entries.insert(tk.END, f"{where} {data.get('name', fname)} - {record.get('percent')}% ({record.get('hz', '')}Hz)")
+
+    def rename_player(self):
+        old = self._selected_player()
+        if not old:
+            messagebox.showwarning("Players", "Select a player first.")
+            return
+        new = simpledialog.askstring("Rename Player", f"New name for {old}:", initialvalue=old)
+        if not new or not new.strip() or new.strip() == old: return
+        new = new.strip()
+        if self.player_index.levels_of(new) and _name_key(new) != _name_key(old):
+            if not messagebox.askyesno("Merge Players", f"{new} already exists. Merge {old} into {new}?\n"
+                                                         "Where both have a record on a level, only the best is kept."):
+                return
+
+        # Every touched level is written once, in the background, after any journaled edits
+        if self.store.dirty:
+            self.build_site(quiet=True)
+        store = self.store.detached()
+        fnames = self.player_index.levels_of(old)
+
+        def job(task):
+            dropped = store.rename_player(old, new, fnames)
+            store.flush()
+            task.progress("Building site files")
+            store.build()
+            return {fname: store.level(fname) for fname in fnames}, dropped
+
+        def done(result):
+            levels, dropped = result
+            if self.store.journal is not None:
+                self.store.journal.forget()  # the rename is not journaled, so older edits cannot be undone over it
+            for fname, data in levels.items():
+                self.search_index.update(fname, data)
+                self.player_index.update(fname, data)
+            self.refresh_levels_list()
+            self.refresh_players_ui()
+            extra = f"\n{dropped} duplicate record(s) dropped." if dropped else ""
+            messagebox.showinfo("Players", f"Renamed {old} to {new} on {len(levels)} level(s).{extra}")
+
+        self.tasks.submit("Renaming player", job, done)
+
+# --- Command line ---
+class _CommandParser(argparse.ArgumentParser):
+    # Raise instead of exiting so batch files can report the failing line
+    def error(self, message):
+        raise ValueError(message)
+
+def _add_level_commands(sub):
+    p = sub.add_parser("add", help="add a level")
+    p.add_argument("filename")
+    p.add_argument("--name")
+    p.add_argument("--id", type=int)
+    p.add_argument("--author")
+    p.add_argument("--creators", help="comma separated")
+    p.add_argument("--verifier")
+    p.add_argument("--verification", help="verification video link")
+    p.add_argument("--password")
+    p.add_argument("--percent-to-qualify", type=int)
+    p.add_argument("--points", type=float)
+    p.add_argument("--rank", type=int, help="1-based position (default: end of list)")
+
+    p = sub.add_parser("move", help="move levels to a rank (several move as one block)")
+    p.add_argument("filenames", nargs="+", metavar="filename")
+    p.add_argument("rank", type=int)
+
+    p = sub.add_parser("order", help="replace the whole list order with the one in a file")
+    p.add_argument("file", help="one level filename per line, or a JSON list like _list.json")
+
+    p = sub.add_parser("delete", help="delete a level and its file")
+    p.add_argument("filename")
+
+    p = sub.add_parser("record", help="add a record to a level")
+    p.add_argument("filename")
+    p.add_argument("user")
+    p.add_argument("percent", type=int)
+    p.add_argument("--hz", type=int, default=360)
+    p.add_argument("--link", default="")
+    p.add_argument("--mobile", action="store_true")
+
+    p = sub.add_parser("points", help="set manual points (-1 = auto)")
+    p.add_argument("filename")
+    p.add_argument("points", type=float)
+
+def build_parser():
+    parser = _CommandParser(
+        prog="manage_list.py",
+        description="Manage the list data. Without a command the manager window opens.")
+    parser.add_argument("--data", default=str(DATA_DIR), help="data folder (default: data)")
+    parser.add_argument("--db", metavar="PATH",
+                        help=f"keep the list in a SQLite database, e.g. {DB_FILE}; data/ is then its export")
+    sub = parser.add_subparsers(dest="command", parser_class=_CommandParser)
+    sub.add_parser("gui", help="open the manager window")
+    _add_level_commands(sub)
+    sub.add_parser("build", help="write the bundle, leaderboard and manifest")
+    sub.add_parser("validate", help="check the data for problems")
+    p = sub.add_parser("backup", help="snapshot data/ (default) or manage snapshots")
+    backup_sub = p.add_subparsers(dest="backup_command", parser_class=_CommandParser)
+    backup_sub.add_parser("list", help="list snapshots")
+    bp = backup_sub.add_parser("restore", help="restore a snapshot or one level from it")
+    bp.add_argument("snapshot")
+    bp.add_argument("--level", help="only restore this level filename")
+    bp = backup_sub.add_parser("prune", help="delete old snapshots and unused files")
+    bp.add_argument("--keep-last", type=int, default=BACKUP_KEEP_LAST)
+    bp.add_argument("--keep-daily", type=int, default=BACKUP_KEEP_DAILY)
+    bp = backup_sub.add_parser("export", help="write a snapshot out as a normal folder")
+    bp.add_argument("snapshot")
+    bp.add_argument("dest")
+    p = sub.add_parser("deploy", help="build, then commit and push the data files that changed")
+    p.add_argument("--remote", help="repository URL (default: github_url from settings)")
+    p.add_argument("--branch", default="main")
+    p.add_argument("--force", action="store_true", help="deploy even if validation finds problems")
+    p = sub.add_parser("import", help="add records from a .jsonl or .csv submissions file")
+    p.add_argument("file")
+    p.add_argument("--dry-run", action="store_true", help="only report what would be added")
+    p = sub.add_parser("player", help="list a player's records, or rename/merge them on every level")
+    p.add_argument("name")
+    p.add_argument("--rename", metavar="NEW", help="new name; an existing player of that name is merged")
+    p = sub.add_parser("db", help="SQLite storage: import data/, export it back, or query it")
+    db_sub = p.add_subparsers(dest="db_command", parser_class=_CommandParser)
+    db_sub.required = True
+    db_sub.add_parser("import", help=f"replace the database contents (--db, default {DB_FILE}) with data/")
+    db_sub.add_parser("export", help="write data/ from the database")
+    bp = db_sub.add_parser("player", help="list every record of a player")
+    bp.add_argument("name")
+    bp = db_sub.add_parser("creator", help="list the levels a player made or verified")
+    bp.add_argument("name")
+    p = sub.add_parser("batch", help="apply a file of commands with one load and one save")
+    p.add_argument("file", help="one command per line, e.g. 'move MyLevel 3' (# for comments)")
+    return parser
+
+def _batch_parser():
+    parser = _CommandParser(prog="batch", add_help=False)
+    _add_level_commands(parser.add_subparsers(dest="command", parser_class=_CommandParser))
+    return parser
+
+def apply_command(store, args):
+    """Apply one level command to `store` (in memory) and return a summary."""
+    if args.command == "add":
+        fields = {}
+        for key, value in (("name", args.name), ("id", args.id), ("author", args.author),
+                           ("verifier", args.verifier), ("verification", args.verification),
+                           ("password", args.password), ("percentToQualify", args.percent_to_qualify),
+                           ("points", args.points)):
+            if value is not None:
+                fields[key] = value
+        if args.creators is not None:
+            fields["creators"] = [c.strip() for c in args.creators.split(",") if c.strip()]
+        store.add_level(args.filename, fields, args.rank)
+        return f"Added {args.filename} at #{store.level_files.index(args.filename.strip()) + 1}"
+    if args.command == "move":
+        store.move_levels(args.filenames, args.rank)
+        first = min(store.level_files.index(fname) for fname in args.filenames)
+        return f"Moved {', '.join(args.filenames)} to #{first + 1}"
+    if args.command == "order":
+        changed = store.reorder_levels(read_order_file(args.file))
+        if changed is None:
+            return "Order unchanged"
+        return f"Reordered the list (#{changed[0] + 1} to #{changed[1] + 1} changed)"
+    if args.command == "delete":
+        store.delete_level(args.filename)
+        return f"Deleted {args.filename}"
+    if args.command == "record":
+        store.add_record(args.filename, args.user, args.percent, args.hz, args.link, args.mobile)
+        return f"Added record {args.user} {args.percent}% to {args.filename}"
+    if args.command == "points":
+        store.set_points(args.filename, args.points)
+        return f"Set points of {args.filename} to {args.points}"
+    raise ValueError(f"Unknown command: {args.command}")
+
+def run_batch(store, path):
+    """Apply every command in `path`; nothing is written unless all succeed."""
+    parser = _batch_parser()
+    summaries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                summaries.append(apply_command(store, parser.parse_args(shlex.split(line))))
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+    store.flush()
+    return summaries
+
+def run_backup_command(store, args):
+    snapshots = store.snapshots
+    if args.backup_command is None:
+        print(f"Snapshot {store.backup()} created in {store.backup_dir}")
+    elif args.backup_command == "list":
+        for snap_id, manifest in snapshots.list():
+            label = f"  {manifest['label']}" if manifest.get("label") else ""
+            print(f"{snap_id}  {len(manifest['files'])} files{label}")
+    elif args.backup_command == "restore":
+        restored, removed = store.restore_snapshot(args.snapshot, args.level)
+        print(f"Restored {len(restored)} file(s), removed {len(removed)}")
+        store.build()
+    elif args.backup_command == "prune":
+        removed, objects = snapshots.prune(args.keep_last, args.keep_daily)
+        print(f"Removed {removed} snapshot(s) and {objects} unused file(s)")
+    elif args.backup_command == "export":
+        print(f"Exported to {snapshots.export(args.snapshot, args.dest)}")
+    return 0
+
+def format_player_entries(store, entries):
+    lines = []
+    for rank, fname, index, role in entries:
+        where = f"#{rank}" if rank else "unlisted"
+        if role == "verifier":
+            lines.append(f"{where}  {fname}  verifier")
+        else:
+            record = store.level(fname)["records"][index]
+            lines.append(f"{where}  {fname}  {record.get('percent')}%  {record.get('hz', '')}Hz")
+    return lines
+
+def run_db_command(store, args):
+    if args.db_command == "import":
+        count = store.import_json()
+        print(f"Imported {count} level(s) from {store.data_dir} into {store.db_path}")
+        return 0
+    store.load()
+    if args.db_command == "export":
+        written, removed = store.export_json()
+        store.build()
+        print(f"Wrote {len(written)} file(s), removed {len(removed)}")
+    elif args.db_command == "player":
+        rows = store.records_of(args.name)
+        for rank, fname, record in rows:
+            print(f"{'#' + str(rank) if rank else 'unlisted'}  {fname}  {record.get('percent')}%")
+        print(f"{len(rows)} record(s)")
+    elif args.db_command == "creator":
+        rows = store.levels_of(args.name)
+        for rank, fname, role in rows:
+            print(f"{'#' + str(rank) if rank else 'unlisted'}  {fname}  {role}")
+        print(f"{len(rows)} level(s)")
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except ValueError as e:
+        parser.print_usage(sys.stderr)
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.command in (None, "gui"):
+        if tk is None:
+            print("error: tkinter is not available, use a command (see --help)", file=sys.stderr)
+            return 2
+        app = ListManager(args.data, args.db)
+        app.mainloop()
+        return 0
+
+    if args.command == "db":
+        args.db = args.db or str(DB_FILE)
+    store = SQLiteStore(args.db, args.data) if args.db else ListStore(args.data)
+    try:
+        if args.command == "db":
+            return run_db_command(store, args)
+        # Edits a crashed manager window left only in the journal are written
+        # first; the commands themselves write their files directly
+        store.open_journal()
+        store.load()
+        if store.recovered:
+            store.flush()
+            print(f"Recovered {store.recovered} unsaved edit(s) from {JOURNAL_FILE}")
+        store.journal = None
+        if args.command == "build":
+            errors = store.build()
+            print(f"Wrote {store.data_dir / BUNDLE_FILE.name}, the list pages, {LEADERBOARD_FILE.name}, {ROULETTE_FILE.name} and {MANIFEST_FILE.name}")
+            for fname in errors:
+                print(f"Failed to load level: {fname}")
+            return 1 if errors else 0
+        if args.command == "validate":
+            problems = store.validate()
+            for problem in problems:
+                print(problem)
+            print(f"{len(store.level_files)} levels checked, {len(problems)} problem(s)")
+            return 1 if problems else 0
+        if args.command == "backup":
+            return run_backup_command(store, args)
+        if args.command == "deploy":
+            repo_url = args.remote or store.settings_data.get("github_url", "").strip()
+            if not repo_url:
+                print("error: no repository URL (set github_url in settings or pass --remote)", file=sys.stderr)
+                return 1
+            problems = store.validate()
+            if problems and not args.force:
+                for problem in problems:
+                    print(problem)
+                print(f"error: {len(problems)} problem(s) found, fix them or deploy with --force", file=sys.stderr)
+                return 1
+            store.build()
+            log, pushed = deploy_site(store.data_dir.parent, repo_url, store.data_dir, args.branch, print)
+            print("Deployed" if pushed else "Nothing to deploy")
+            return 0
+        if args.command == "import":
+            report = import_records(store, args.file)
+            if args.dry_run or not report["accepted"]:
+                print(format_import_report(report))
+                return 0
+            store.flush()
+            summaries = [format_import_report(report)]
+        elif args.command == "player":
+            index = PlayerIndex()
+            index.build(store.level_files, store.level)
+            entries = index.entries(args.name, store.level_files)
+            if not entries:
+                raise ValueError(f"Player '{args.name}' not found")
+            if not args.rename:
+                for line in format_player_entries(store, entries):
+                    print(line)
+                print(f"{len(entries)} entries")
+                return 0
+            fnames = index.levels_of(args.name)
+            dropped = store.rename_player(args.name, args.rename, fnames)
+            store.flush()
+            summaries = [f"Renamed {args.name} to {args.rename.strip()} on {len(fnames)} level(s)"
+                         + (f", dropped {dropped} duplicate record(s)" if dropped else "")]
+        elif args.command == "batch":
+            summaries = run_batch(store, args.file)
+        else:
+            summaries = [apply_command(store, args)]
+            store.flush()
+    except (ValueError, OSError, DeployError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    for line in summaries:
+        print(line)
+    store.build()
+    return 0
 
 if __name__ == "__main__":
-    app = ListManager()
-    app.mainloop()
+    sys.exit(main())
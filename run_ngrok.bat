@@ -2,7 +2,7 @@
 echo Starting Local Server and Ngrok...
 echo.
 echo 1. Starting Python Server on port 8000...
-start "Local Server" python -m http.server 8000
+start "Local Server" python serve.py 8000 --no-reload
 echo.
 echo 2. Starting Ngrok Tunnel...
 echo    (If this fails, make sure 'ngrok.exe' is in this folder or installed)
@@ -1,5 +1,5 @@
 @echo off
 echo Starting local server on port 8000...
 echo Open http://localhost:8000 in your browser.
-python -m http.server 8000
+python serve.py 8000
 pause
@@ -0,0 +1,195 @@
+"""Local preview server for the site.
+
+    python serve.py                  # http://localhost:8000
+    python serve.py 8080 --no-reload
+
+Unlike `python -m http.server` it answers requests in parallel, sends a
+file's `.gz` copy (such as `data/_bundle.json.gz`) to browsers that accept
+gzip, and answers repeat requests with 304 Not Modified using ETags. Files
+requested by content hash (`?v=...`) are cached for good. Open pages reload
+by themselves when files in data/ change, e.g. when the manager saves.
+"""
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent
+DATA_DIR = ROOT / "data"
+RELOAD_PATH = "/__livereload"
+POLL_SECONDS = 0.5
+HEARTBEAT_SECONDS = 15
+RELOAD_SCRIPT = (b'<script>new EventSource("' + RELOAD_PATH.encode() + b'")'
+                 b'.addEventListener("reload", () => location.reload());</script>\n')
+
+class ChangeFeed:
+    """Polls a folder and bumps `version` once a burst of changes is over.
+
+    A save writes several files in a row (levels, list, bundle, manifest),
+    so the version only moves after a poll that saw no further change.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.version = 0
+        self._changed = threading.Condition()
+
+    def _stat_all(self):
+        seen = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("."):  # skips half-written temp files
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        seen[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return seen
+
+    def run(self):
+        last = self._stat_all()
+        pending = False
+        while True:
+            time.sleep(POLL_SECONDS)
+            seen = self._stat_all()
+            if seen != last:
+                last = seen
+                pending = True
+            elif pending:
+                pending = False
+                with self._changed:
+                    self.version += 1
+                    self._changed.notify_all()
+
+    def wait(self, version, timeout):
+        """Wait until `version` is out of date or `timeout` passes; returns the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    feed = None  # ChangeFeed, or None without live reload
+
+    def do_GET(self):
+        if self.feed is not None and urlsplit(self.path).path == RELOAD_PATH:
+            self.stream_reloads()
+            return
+        super().do_GET()
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                return super().send_head()  # redirect to "dir/", or a listing
+            path = index
+
+        content_type = self.guess_type(path)
+        inject = self.feed is not None and content_type == "text/html"
+        served, encoding = path, None
+        gz = path + ".gz"
+        if (not inject and "gzip" in self.headers.get("Accept-Encoding", "")
+                and os.path.isfile(gz) and os.path.isfile(path)
+                and os.path.getmtime(gz) >= os.path.getmtime(path)):
+            served, encoding = gz, "gzip"
+        try:
+            f = open(served, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            st = os.fstat(f.fileno())
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if encoding else ""}{"-lr" if inject else ""}"'
+            if "v" in parse_qs(urlsplit(self.path).query):
+                cache_control = "public, max-age=31536000, immutable"  # the URL changes with the content
+            else:
+                cache_control = "no-cache"  # always revalidate, usually a 304
+
+            if_none_match = self.headers.get("If-None-Match", "")
+            if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+                f.close()
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", cache_control)
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return None
+
+            length = st.st_size
+            if inject:
+                page = f.read()
+                f.close()
+                end = page.rfind(b"</body>")
+                page = page[:end] + RELOAD_SCRIPT + page[end:] if end != -1 else page + RELOAD_SCRIPT
+                f, length = io.BytesIO(page), len(page)
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(length))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", self.date_time_string(st.st_mtime))
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def stream_reloads(self):
+        # Server-sent events: "reload" after data/ changes, a comment line as heartbeat
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = self.feed.version
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while True:
+                current = self.feed.wait(version, HEARTBEAT_SECONDS)
+                if current != version:
+                    version = current
+                    self.wfile.write(b"event: reload\ndata: data\n\n")
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass  # the page was closed or reloaded
+        self.close_connection = True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the site for local preview.")
+    parser.add_argument("port", nargs="?", type=int, default=8000, help="port (default: 8000)")
+    parser.add_argument("--bind", default="", help="address to listen on (default: all)")
+    parser.add_argument("--no-reload", action="store_true", help="do not reload pages when data/ changes")
+    args = parser.parse_args(argv)
+
+    if not args.no_reload:
+        PreviewHandler.feed = ChangeFeed(DATA_DIR)
+        threading.Thread(target=PreviewHandler.feed.run, name="data-watch", daemon=True).start()
+    server = ThreadingHTTPServer((args.bind, args.port), partial(PreviewHandler, directory=str(ROOT)))
+    print(f"Serving {ROOT} on http://localhost:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+// Runs js/score.js and the leaderboard fallback in js/content.js for
+// tests/test_score.py. Reads {scores, rounds, files} as JSON on stdin:
+// `files` maps data file names to their content, served through a fake fetch.
+import { round, score } from '../js/score.js';
+import { fetchLeaderboard } from '../js/content.js';
+
+let input = '';
+for await (const chunk of process.stdin) input += chunk;
+const { scores, rounds, files } = JSON.parse(input);
+
+globalThis.fetch = async (url) => {
+    const name = url.split('?')[0].replace(/^\.\/data\//, '');
+    const found = Object.hasOwn(files, name);
+    return {
+        ok: found,
+        json: async () => {
+            if (!found) throw new Error(`no ${name}`);
+            return structuredClone(files[name]);
+        },
+    };
+};
+
+process.stdout.write(JSON.stringify({
+    scores: scores.map((args) => score(...args)),
+    rounds: rounds.map((num) => round(num)),
+    leaderboard: await fetchLeaderboard(),
+}));
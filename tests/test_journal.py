@@ -0,0 +1,71 @@
+"""Undo and redo must not throw away changes the journal did not see.
+
+    python -m unittest discover tests
+"""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import manage_list as ml
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data = Path(tmp.name) / "data"
+        self.data.mkdir()
+        for fname in ("A", "B"):
+            level = {"name": fname, "points": -1, "records": [{"user": "x", "percent": 100}]}
+            (self.data / f"{fname}.json").write_text(json.dumps(level))
+        (self.data / "_list.json").write_text(json.dumps(["A", "B"]))
+        self.store = ml.ListStore(self.data)
+        self.store.open_journal()
+        self.store.load()
+
+    def outside_edit(self, fname, user):
+        # As the command line or another program would: straight to data/
+        path = self.data / f"{fname}.json"
+        level = json.loads(path.read_text())
+        level["records"].append({"user": user, "percent": 90})
+        path.write_text(json.dumps(level))
+        self.store.levels.clear()
+
+    def users(self, fname):
+        return [record["user"] for record in self.store.level(fname)["records"]]
+
+    def test_undo_keeps_other_fields(self):
+        self.store.set_points("A", 5)
+        self.store.flush()
+        self.outside_edit("A", "Carol")
+        self.store.undo()
+        self.assertEqual(self.store.level("A")["points"], -1)
+        self.assertEqual(self.users("A"), ["x", "Carol"])
+
+    def test_undo_refuses_over_outside_change(self):
+        self.store.add_record("B", "Dan", 95)
+        self.store.flush()
+        self.outside_edit("B", "Eve")
+        with self.assertRaises(ValueError):
+            self.store.undo()
+        self.assertEqual(self.users("B"), ["x", "Dan", "Eve"])
+        self.assertEqual(len(self.store.journal.undo_stack), 1)
+        self.store.undo(force=True)
+        self.assertEqual(self.users("B"), ["x"])
+
+    def test_forget_survives_restart(self):
+        self.store.set_points("A", 5)
+        self.store.flush()
+        self.store.journal.forget()
+        other = ml.ListStore(self.data)
+        other.open_journal()
+        other.load()
+        self.assertIsNone(other.undo())
+        self.assertEqual(other.level("A")["points"], 5)
+
+if __name__ == "__main__":
+    unittest.main()
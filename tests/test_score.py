@@ -0,0 +1,104 @@
+"""Python scoring must give the same numbers as js/score.js.
+
+    python -m unittest discover tests
+
+The parity tests run tests/score_parity.mjs and are skipped without node.
+"""
+import json
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import manage_list as ml
+
+SCORE_CASES = [
+    # rank, percent, minPercent, points
+    (1, 100, 50, -1),
+    (1, 100, 100, None),
+    (2, 100, 60, -1),
+    (10, 60, 60, -1),     # percent == requirement, not 100
+    (10, 99, 60, -1),
+    (75, 100, 50, -1),
+    (76, 100, 100, -1),
+    (150, 100, 100, -1),
+    (151, 100, 100, -1),  # past the extended list
+    (400, 100, 100, -1),
+    (200, 100, 100, 0),   # legacy manual points
+    (200, 100, 100, 12.5),
+    (3, 100, 50, 0),
+    (3, 80, 50, 7),       # manual points do not apply below 100%
+]
+ROUND_CASES = [0, 1.0005, 1.005, 2.675, 123.4565, 199.9995, 0.0005, 0.00049, 1e-7, 5e-4, 187.2089999, 4.4e-9]
+
+def leaderboard_fixture():
+    """155 levels: ranks past 150, manual points, mixed-case players, one broken level."""
+    order, levels = [], {}
+    for i in range(155):
+        fname = f"level{i}"
+        order.append(fname)
+        records = [
+            {"user": "Bob" if i % 2 else "bob", "link": f"b{i}", "percent": 100, "hz": 60},
+            {"user": f"Player{i % 7}", "link": f"p{i}", "percent": [60, 100, 99, 75][i % 4], "hz": 144},
+        ]
+        levels[fname] = {
+            "id": i, "name": f"Level {i}", "author": "A", "creators": [], "verifier": f"Verifier{i % 5}",
+            "verification": f"v{i}", "percentToQualify": [60, 100, 75][i % 3], "records": records,
+            "points": [-1, -1, -1, 0, 25.5][i % 5] if i >= 140 else -1,
+        }
+    order.append("missing")
+    return order, levels
+
+class ScoreTest(unittest.TestCase):
+    def test_rules(self):
+        self.assertEqual(ml.score(1, 100, 50), 200)
+        self.assertEqual(ml.score(1, 99, 50), 0)
+        self.assertEqual(ml.score(151, 100, 100), 0)
+        self.assertEqual(ml.score(200, 100, 100, 0), 0)
+        self.assertEqual(ml.score(200, 100, 100, 12.5), 12.5)
+
+    def test_round_halves_go_up(self):
+        self.assertEqual(ml.round_score(1.0005), 1.001)
+        self.assertEqual(ml.round_score(2.675), 2.675)
+        self.assertEqual(ml.round_score(0.00049), 0)
+
+    def test_leaderboard_folds_names(self):
+        order, levels = leaderboard_fixture()
+        leaderboard, errors = ml.compute_leaderboard(order, levels)
+        self.assertEqual(errors, ["missing"])
+        users = [entry["user"] for entry in leaderboard]
+        self.assertEqual(len(users), len({u.lower() for u in users}))
+        self.assertIn("bob", users)  # the first spelling seen wins
+
+@unittest.skipUnless(shutil.which("node"), "node is not installed")
+class ParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        order, levels = leaderboard_fixture()
+        cls.order, cls.levels = order, levels
+        files = {f"{fname}.json": data for fname, data in levels.items()}
+        files["_list.json"] = order
+        payload = {"scores": SCORE_CASES, "rounds": ROUND_CASES, "files": files}
+        result = subprocess.run(["node", str(ROOT / "tests" / "score_parity.mjs")], input=json.dumps(payload),
+                                capture_output=True, text=True, encoding="utf-8", check=True)
+        cls.js = json.loads(result.stdout)
+
+    def test_score(self):
+        python = [ml.score(*args) for args in SCORE_CASES]
+        self.assertEqual(python, self.js["scores"])
+
+    def test_round(self):
+        for num, expected in zip(ROUND_CASES, self.js["rounds"]):
+            self.assertEqual(ml.round_score(num), expected, num)
+
+    def test_leaderboard(self):
+        leaderboard, errors = ml.compute_leaderboard(self.order, self.levels)
+        # Compared as JSON, the form the site reads
+        self.assertEqual(json.loads(json.dumps([leaderboard, errors])), self.js["leaderboard"])
+
+if __name__ == "__main__":
+    unittest.main()